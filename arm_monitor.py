@@ -10,6 +10,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import signal
 import time
 
 from backends.franka import FrankaBackend
@@ -22,26 +23,69 @@ logger = logging.getLogger(__name__)
 # Paths
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 _FRANKA_SERVER_DIR = os.path.join(_PROJECT_ROOT, "franka_interact", "franka_server")
-_VENV_ACTIVATE = os.path.join(_PROJECT_ROOT, "franka_interact", ".venv", "bin", "activate")
+_VENV_DIR = os.path.join(_PROJECT_ROOT, "franka_interact", ".venv")
+_VENV_BIN = os.path.join(_VENV_DIR, "bin")
+_VENV_PYTHON = os.path.join(_VENV_BIN, "python")
 
 # Robot IP (from env or default)
 _ROBOT_IP = os.environ.get("FRANKA_IP", "172.16.0.2")
 
+# start_server.sh output lines that mean the server is up (lowercase bytes)
+_SERVER_READY_TOKENS = (b"control loop running", b"server started", b"connected to robot")
+
+
+def _venv_env() -> dict[str, str]:
+    """Environment equivalent to sourcing the venv's ``activate`` script."""
+    env = dict(os.environ)
+    env.pop("PYTHONHOME", None)
+    env["VIRTUAL_ENV"] = _VENV_DIR
+    env["PATH"] = _VENV_BIN + os.pathsep + env.get("PATH", "")
+    return env
+
+
+async def _log_lines(stream: asyncio.StreamReader, level: int, tag: str) -> None:
+    """Log a child process pipe line by line until EOF.
+
+    Lines are still drained when ``level`` is disabled, but not decoded.
+    """
+    enabled = logger.isEnabledFor(level)
+    while True:
+        line = await stream.readline()
+        if not line:
+            return
+        if enabled:
+            text = line.decode(errors="replace").rstrip()
+            if text:
+                logger.log(level, "ArmMonitor [%s]: %s", tag, text)
+
 
 class ArmMonitor:
     """Async background task that detects arm server crashes and auto-recovers.
 
     Detection: ZMQ ``_state_count`` on the FrankaClient stops advancing for
     ``ARM_DOWN_GRACE_PERIOD`` seconds, meaning franka_server stopped publishing.
+    The loop sleeps until the stream could next go stale rather than ticking
+    at a fixed rate, so a healthy arm costs one wakeup per grace period.
     Recovery: stop code execution, disconnect backend, run ``recover.py``,
     restart ``start_server.sh``, reconnect backend, trigger safety rewind.
     """
 
+    __slots__ = (
+        "_state_agg", "_franka", "_orchestrator", "_rewind_cfg",
+        "_franka_config", "_robot_ip", "_service_manager", "_task",
+        "_arm_down_since", "_arm_was_connected",
+        "_recovery_eligible_at",
+        "_is_recovering", "_recovery_count", "_last_recovery_time", "_last_recovery_at",
+        "_recovery_suppressed", "_server_proc", "_server_log_task",
+    )
+
     ARM_DOWN_GRACE_PERIOD = 3.0  # seconds of no ZMQ messages before recovery
     RECOVERY_COOLDOWN = 30.0  # seconds between recovery attempts
     RECOVER_TIMEOUT = 30.0  # max seconds for recover.py
     SERVER_START_TIMEOUT = 15.0  # max seconds waiting for server to come up
-    MONITOR_INTERVAL = 1.0  # check every second
+    SERVER_EXIT_TIMEOUT = 5.0  # max seconds waiting for killed servers to exit
+    ARM_STATE_TIMEOUT = 13.0  # max seconds from reconnect to first valid arm state
+    MONITOR_INTERVAL = 1.0  # re-check interval while the arm is down / not yet seen
 
     def __init__(
         self,
@@ -55,23 +99,31 @@ class ArmMonitor:
         self._state_agg = state_agg
         self._franka = franka_backend
         self._orchestrator = rewind_orchestrator
+        # Rewind config is updated in place by /rewind/config, so the
+        # reference stays valid for the monitor's lifetime
+        self._rewind_cfg = rewind_orchestrator.config
         self._franka_config = franka_config
         self._robot_ip = robot_ip
         self._service_manager = service_manager  # optional ServiceManager
 
         self._task: asyncio.Task | None = None
 
-        # Detection state — track ZMQ state_count from the backend client
-        self._arm_down_since: float | None = None
+        # Detection state — driven by the backend's last ZMQ state timestamp
+        self._arm_down_since: float | None = None  # monotonic
         self._arm_was_connected: bool = False  # track if arm was ever up
-        self._last_state_count: int | None = None  # last observed _state_count
-        self._last_state_count_time: float = 0.0  # when _state_count last advanced
+        # Monotonic time at which recovery may fire (grace and cooldown
+        # folded together); None while the arm is up
+        self._recovery_eligible_at: float | None = None
 
         # Recovery state
         self._is_recovering: bool = False
         self._recovery_count: int = 0
-        self._last_recovery_time: float | None = None
+        self._last_recovery_time: float | None = None  # wall clock, for status
+        self._last_recovery_at: float | None = None  # monotonic, for cooldown
         self._recovery_suppressed: bool = False  # set when user intentionally stops server
+        # franka_server started by _restart_via_shell (own process group)
+        self._server_proc: asyncio.subprocess.Process | None = None
+        self._server_log_task: asyncio.Task | None = None  # drains its stdout
 
     # -- public status -------------------------------------------------------
 
@@ -88,12 +140,16 @@ class ArmMonitor:
         return self._last_recovery_time
 
     def get_status(self) -> dict:
+        down_since = self._arm_down_since
+        if down_since is not None:
+            # Detection runs on the monotonic clock; report wall-clock time
+            down_since = time.time() - (time.monotonic() - down_since)
         return {
             "is_running": self._task is not None and not self._task.done(),
             "is_recovering": self._is_recovering,
             "recovery_suppressed": self._recovery_suppressed,
-            "arm_down_detected": self._arm_down_since is not None,
-            "arm_down_since": self._arm_down_since,
+            "arm_down_detected": down_since is not None,
+            "arm_down_since": down_since,
             "recovery_count": self._recovery_count,
             "last_recovery_time": self._last_recovery_time,
         }
@@ -101,14 +157,13 @@ class ArmMonitor:
     def suppress_recovery(self) -> None:
         """Suppress auto-recovery (call when user intentionally stops server)."""
         self._recovery_suppressed = True
-        self._arm_down_since = None
+        self._set_arm_down(None)
         logger.info("ArmMonitor: recovery suppressed (intentional stop)")
 
     def allow_recovery(self) -> None:
         """Re-enable auto-recovery (call when server is started again)."""
         self._recovery_suppressed = False
         self._arm_was_connected = False
-        self._last_state_count = None
         logger.info("ArmMonitor: recovery enabled")
 
     # -- lifecycle -----------------------------------------------------------
@@ -132,79 +187,84 @@ class ArmMonitor:
     # -- main loop -----------------------------------------------------------
 
     async def _monitor_loop(self) -> None:
+        # Bind hot-path lookups once; they do not change while the task runs.
+        franka = self._franka
+        clock = time.monotonic
+        sleep = asyncio.sleep
+        check = self._check_arm_state
+        should_trigger = self._should_trigger_recovery
+        grace = self.ARM_DOWN_GRACE_PERIOD
+        interval = self.MONITOR_INTERVAL
+        last_rx: float | None = None
+
         while True:
             try:
                 if not self._is_recovering:
-                    self._check_arm_state()
+                    now = clock()
+                    last_rx = franka.last_state_time
+                    check(last_rx, now)
 
-                    if self._should_trigger_recovery():
+                    if should_trigger(now):
                         await self._run_recovery()
-
-                await asyncio.sleep(self.MONITOR_INTERVAL)
+                        last_rx = franka.last_state_time
+
+                # Sleep until the stream would next go stale; while it is
+                # healthy every message pushes that deadline out.
+                if last_rx is None or not self._arm_was_connected or self._arm_down_since is not None:
+                    await sleep(interval)
+                else:
+                    await sleep(max(0.0, last_rx + grace - clock()))
             except asyncio.CancelledError:
                 raise
             except Exception:
                 logger.exception("ArmMonitor error")
-                await asyncio.sleep(self.MONITOR_INTERVAL)
+                await sleep(interval)
 
-    def _check_arm_state(self) -> None:
+    def _check_arm_state(self, last_rx: float | None, now: float) -> None:
         """Check if franka_server ZMQ stream is alive.
 
-        Uses the FrankaClient ``_state_count`` counter directly — this
-        increments on every ZMQ message received.  If it stops advancing,
-        the franka_server process is down.  This is more reliable and
-        faster than checking for empty ``q`` through the state aggregator.
+        Piggybacks on the backend's record of when the FrankaClient
+        ``_state_count`` counter last advanced (``last_rx``) — it increments
+        on every ZMQ message received.  If it has not advanced for
+        ``ARM_DOWN_GRACE_PERIOD``, the franka_server process is down.
         """
-        now = time.time()
-
-        # Get the raw ZMQ client from the backend
-        client = getattr(self._franka, '_client', None)
-        if client is None:
-            # Backend not connected yet — nothing to monitor
-            return
-
-        current_count = getattr(client, '_state_count', None)
-        if current_count is None:
+        if last_rx is None:
+            # No ZMQ message received yet — nothing to monitor
             return
 
-        if self._last_state_count is None or current_count != self._last_state_count:
+        silent_for = now - last_rx
+        if silent_for < self.ARM_DOWN_GRACE_PERIOD:
             # ZMQ messages are still arriving — server is alive
-            self._last_state_count = current_count
-            self._last_state_count_time = now
-            self._arm_down_since = None
-            if current_count > 0:
-                self._arm_was_connected = True
-        else:
-            # _state_count hasn't advanced — server stopped publishing
-            if self._arm_was_connected and self._arm_down_since is None:
-                self._arm_down_since = now
-                logger.warning(
-                    "ArmMonitor: franka_server ZMQ stream stopped "
-                    "(state_count=%d stale for %.1fs)",
-                    current_count,
-                    now - self._last_state_count_time,
-                )
-
-    def _should_trigger_recovery(self) -> bool:
-        """Return True if recovery should be triggered."""
-        if self._recovery_suppressed:
-            return False
-
-        if self._arm_down_since is None:
-            return False
-
-        now = time.time()
-
-        # Check grace period
-        if now - self._arm_down_since < self.ARM_DOWN_GRACE_PERIOD:
-            return False
+            if self._arm_down_since is not None:
+                self._set_arm_down(None)
+            self._arm_was_connected = True
+        elif self._arm_was_connected and self._arm_down_since is None:
+            # Stream went silent — the grace period already ran out since
+            # the last message; after a failed recovery the cooldown
+            # (counted from that attempt) holds off the next one
+            self._set_arm_down(last_rx)
+            logger.warning(
+                "ArmMonitor: franka_server ZMQ stream stopped "
+                "(no state for %.1fs)",
+                silent_for,
+            )
 
-        # Check cooldown from last recovery
-        if self._last_recovery_time is not None:
-            if now - self._last_recovery_time < self.RECOVERY_COOLDOWN:
-                return False
+    def _set_arm_down(self, since: float | None) -> None:
+        """Record when the arm went down and precompute when recovery may fire."""
+        self._arm_down_since = since
+        if since is None:
+            self._recovery_eligible_at = None
+            return
+        eligible = since + self.ARM_DOWN_GRACE_PERIOD
+        if self._last_recovery_at is not None:
+            eligible = max(eligible, self._last_recovery_at + self.RECOVERY_COOLDOWN)
+        self._recovery_eligible_at = eligible
 
-        return True
+    def _should_trigger_recovery(self, now: float) -> bool:
+        """Return True if recovery should be triggered (``now`` is monotonic)."""
+        # Healthy arm (no deadline) is the common case — test it first
+        eligible = self._recovery_eligible_at
+        return eligible is not None and not self._recovery_suppressed and now >= eligible
 
     # -- recovery sequence ---------------------------------------------------
 
@@ -213,7 +273,7 @@ class ArmMonitor:
         self._is_recovering = True
         logger.warning(
             "ArmMonitor: arm has been down for %.1fs — starting recovery",
-            time.time() - (self._arm_down_since or time.time()),
+            time.monotonic() - (self._arm_down_since or time.monotonic()),
         )
 
         try:
@@ -225,9 +285,7 @@ class ArmMonitor:
             logger.info("ArmMonitor: disconnecting franka backend")
             try:
                 await asyncio.wait_for(
-                    asyncio.get_event_loop().run_in_executor(
-                        None, self._force_disconnect_backend
-                    ),
+                    asyncio.to_thread(self._force_disconnect_backend),
                     timeout=5.0,
                 )
             except asyncio.TimeoutError:
@@ -235,7 +293,8 @@ class ArmMonitor:
             except Exception as e:
                 logger.warning("ArmMonitor: disconnect error (ignoring): %s", e)
 
-            # 3. Kill existing franka_server processes
+            # 3. Kill existing franka_server processes. This returns once
+            #    they have exited, so none still holds the FCI connection.
             await self._kill_franka_server()
 
             # 4. Run error recovery (clear reflex state)
@@ -251,11 +310,9 @@ class ArmMonitor:
 
             # 6. Reconnect franka backend
             logger.info("ArmMonitor: reconnecting franka backend")
+            self._state_agg.clear_arm_ready()
             try:
-                await self._franka.connect()
-                # Reset detection state for new connection
-                self._last_state_count = None
-                self._last_state_count_time = time.time()
+                await asyncio.to_thread(self._franka.connect)
             except Exception as e:
                 logger.error("ArmMonitor: reconnect failed: %s", e)
                 return
@@ -279,8 +336,10 @@ class ArmMonitor:
         except Exception:
             logger.exception("ArmMonitor: recovery sequence failed")
         finally:
+            # Cooldown counts from every attempt, successful or not
+            self._last_recovery_at = time.monotonic()
             self._is_recovering = False
-            self._arm_down_since = None
+            self._set_arm_down(None)
 
     def _force_disconnect_backend(self) -> None:
         """Synchronous disconnect — runs in executor thread."""
@@ -291,6 +350,7 @@ class ArmMonitor:
             except Exception:
                 pass
             self._franka._client = None
+            self._franka._bind_commands(None)
 
     async def _stop_code_execution(self) -> None:
         """Stop any running code execution."""
@@ -299,7 +359,7 @@ class ArmMonitor:
             executor = get_executor()
             if executor.is_running:
                 logger.info("ArmMonitor: stopping running code execution")
-                executor.stop(reason="arm_error")
+                await executor.stop(reason="arm_error")
         except Exception as e:
             logger.warning("ArmMonitor: failed to stop code execution: %s", e)
 
@@ -312,46 +372,86 @@ class ArmMonitor:
                 logger.info("ArmMonitor: service manager stop result: %s", result)
             except Exception as e:
                 logger.warning("ArmMonitor: service manager stop failed: %s", e)
-        else:
-            logger.info("ArmMonitor: killing existing franka_server processes")
+            return
+
+        if self._server_proc is not None:
+            await self._terminate_server_proc()
+        # Anything still matching was not started by us (service routes, a
+        # manual start after allow_recovery) and may hold FCI — match by name
+        logger.info("ArmMonitor: killing remaining franka_server processes")
+        matched = True
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "pkill", "-f", "franka_server.server",
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            await asyncio.wait_for(proc.wait(), timeout=5.0)
+            matched = proc.returncode != 1  # 1: no process matched
+        except Exception as e:
+            logger.debug("ArmMonitor: pkill result: %s", e)
+        if matched:
+            # pkill does not wait — poll until the processes have exited
+            deadline = time.monotonic() + self.SERVER_EXIT_TIMEOUT
+            while await self._franka_server_running():
+                if time.monotonic() >= deadline:
+                    logger.warning("ArmMonitor: franka_server still running after pkill")
+                    break
+                await asyncio.sleep(0.2)
+
+    @staticmethod
+    async def _franka_server_running() -> bool:
+        """Return True while any process matches ``franka_server.server``."""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "pgrep", "-f", "franka_server.server",
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            return await asyncio.wait_for(proc.wait(), timeout=2.0) == 0
+        except Exception:
+            return False
+
+    async def _terminate_server_proc(self) -> None:
+        """SIGTERM the tracked franka_server process group, escalating to SIGKILL."""
+        proc = self._server_proc
+        self._server_proc = None
+        logger.info("ArmMonitor: stopping franka_server (pgid=%d)", proc.pid)
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
             try:
-                proc = await asyncio.create_subprocess_exec(
-                    "pkill", "-f", "franka_server.server",
-                    stdout=asyncio.subprocess.DEVNULL,
-                    stderr=asyncio.subprocess.DEVNULL,
-                )
                 await asyncio.wait_for(proc.wait(), timeout=5.0)
-            except Exception as e:
-                logger.debug("ArmMonitor: pkill result: %s", e)
-
-        # Give processes time to exit
-        await asyncio.sleep(1.0)
+            except asyncio.TimeoutError:
+                logger.warning("ArmMonitor: franka_server ignored SIGTERM, sending SIGKILL")
+                os.killpg(proc.pid, signal.SIGKILL)
+                await asyncio.wait_for(proc.wait(), timeout=3.0)
+        except ProcessLookupError:
+            pass  # whole process group already gone
+        except Exception as e:
+            logger.debug("ArmMonitor: terminate result: %s", e)
 
     async def _run_recover_script(self) -> bool:
         """Run franka_server.recover to clear reflex state."""
         logger.info("ArmMonitor: running error recovery (ip=%s)", self._robot_ip)
         try:
             proc = await asyncio.create_subprocess_exec(
-                "bash", "-c",
-                f"source {_VENV_ACTIVATE} && python3 -m franka_server.recover --ip {self._robot_ip}",
+                _VENV_PYTHON, "-m", "franka_server.recover", "--ip", self._robot_ip,
                 cwd=_FRANKA_SERVER_DIR,
+                env=_venv_env(),
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
-            stdout, stderr = await asyncio.wait_for(
-                proc.communicate(), timeout=self.RECOVER_TIMEOUT
+            # Stream both pipes as lines arrive instead of buffering the
+            # whole run with communicate()
+            await asyncio.wait_for(
+                asyncio.gather(
+                    _log_lines(proc.stdout, logging.INFO, "recover"),
+                    _log_lines(proc.stderr, logging.WARNING, "recover"),
+                    proc.wait(),
+                ),
+                timeout=self.RECOVER_TIMEOUT,
             )
 
-            stdout_str = stdout.decode().strip()
-            stderr_str = stderr.decode().strip()
-
-            if stdout_str:
-                for line in stdout_str.splitlines():
-                    logger.info("ArmMonitor [recover]: %s", line)
-            if stderr_str:
-                for line in stderr_str.splitlines():
-                    logger.warning("ArmMonitor [recover]: %s", line)
-
             if proc.returncode == 0:
                 logger.info("ArmMonitor: error recovery succeeded")
                 return True
@@ -384,8 +484,7 @@ class ArmMonitor:
             if result.get("ok"):
                 logger.info("ArmMonitor: service manager started franka_server (pid=%s)",
                             result.get("pid"))
-                # Wait for server to be ready (ZMQ publishing)
-                await asyncio.sleep(3.0)
+                # Readiness (ZMQ publishing) is awaited after reconnect
                 return True
             else:
                 logger.error("ArmMonitor: service manager start failed: %s", result.get("error"))
@@ -399,22 +498,25 @@ class ArmMonitor:
         logger.info("ArmMonitor: restarting franka server via shell")
         try:
             proc = await asyncio.create_subprocess_exec(
-                "bash", "-c",
-                f"source {_VENV_ACTIVATE} && exec bash ./start_server.sh --ip {self._robot_ip}",
+                "bash", "./start_server.sh", "--ip", self._robot_ip,
                 cwd=_FRANKA_SERVER_DIR,
+                env=_venv_env(),
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.STDOUT,
+                start_new_session=True,  # own process group so it can be killed as a unit
             )
+            self._server_proc = proc
 
             # Wait for server to start (watch stdout for "ready" or just wait)
             started = False
+            log_info = logger.isEnabledFor(logging.INFO)
             try:
-                deadline = time.time() + self.SERVER_START_TIMEOUT
-                while time.time() < deadline:
+                deadline = time.monotonic() + self.SERVER_START_TIMEOUT
+                while time.monotonic() < deadline:
                     try:
                         line_bytes = await asyncio.wait_for(
                             proc.stdout.readline(),
-                            timeout=max(0.1, deadline - time.time()),
+                            timeout=max(0.1, deadline - time.monotonic()),
                         )
                     except asyncio.TimeoutError:
                         break
@@ -422,12 +524,15 @@ class ArmMonitor:
                     if not line_bytes:
                         break
 
-                    line = line_bytes.decode().strip()
-                    if line:
-                        logger.info("ArmMonitor [server]: %s", line)
+                    if log_info:
+                        line = line_bytes.decode(errors="replace").strip()
+                        if line:
+                            logger.info("ArmMonitor [server]: %s", line)
 
-                    lower = line.lower()
-                    if "control loop running" in lower or "server started" in lower or "connected to robot" in lower:
+                    # Match readiness on raw bytes so nothing is decoded
+                    # when INFO logging is off
+                    lower = line_bytes.lower()
+                    if any(token in lower for token in _SERVER_READY_TOKENS):
                         started = True
                         break
 
@@ -442,6 +547,10 @@ class ArmMonitor:
                 logger.info("ArmMonitor: franka server process running (pid=%d), assuming startup", proc.pid)
                 started = True
 
+            # Keep draining server output so a full pipe never blocks it
+            self._server_log_task = asyncio.create_task(
+                _log_lines(proc.stdout, logging.INFO, "server")
+            )
             return started
 
         except Exception as e:
@@ -451,21 +560,16 @@ class ArmMonitor:
     async def _wait_for_arm_state(self) -> bool:
         """Wait for valid arm state to appear after reconnect."""
         logger.info("ArmMonitor: waiting for arm state...")
-        deadline = time.time() + 10.0
-        while time.time() < deadline:
-            state = self._state_agg.state
-            arm_q = state.get("arm", {}).get("q", [])
-            if arm_q and len(arm_q) == 7:
-                logger.info("ArmMonitor: arm state available")
-                return True
-            await asyncio.sleep(0.5)
+        if await self._state_agg.wait_arm_ready(timeout=self.ARM_STATE_TIMEOUT):
+            logger.info("ArmMonitor: arm state available")
+            return True
 
-        logger.warning("ArmMonitor: arm state not available after 10s")
+        logger.warning("ArmMonitor: arm state not available after %.0fs", self.ARM_STATE_TIMEOUT)
         return False
 
     async def _trigger_rewind(self) -> None:
         """Trigger safety rewind after recovery (only if auto-rewind is enabled)."""
-        cfg = self._orchestrator.config
+        cfg = self._rewind_cfg
         if not cfg.auto_rewind_enabled:
             logger.info("ArmMonitor: skipping safety rewind (auto-rewind disabled)")
             return
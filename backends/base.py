@@ -20,6 +20,12 @@ class _BaseManager(multiprocessing.managers.BaseManager):
 
 _BaseManager.register("Base")
 
+# Proxy methods resolved once per connection instead of by name per call
+_RPC_METHODS = ("get_state", "execute_action", "set_target_velocity", "stop", "reset")
+
+# Errors raised by the manager proxy when base_server goes away
+_CONNECTION_ERRORS = (BrokenPipeError, EOFError, ConnectionResetError, OSError)
+
 
 class BaseBackendError(Exception):
     """Raised when base backend is unavailable or connection fails."""
@@ -29,39 +35,58 @@ class BaseBackendError(Exception):
 class BaseBackend:
     """Thin wrapper around BaseServer's multiprocessing RPC interface."""
 
+    __slots__ = (
+        "_cfg", "_dry_run", "_address", "_authkey", "_manager", "_base",
+        "_last_cmd_vel", "_last_cmd_time", "_cmd_is_velocity", "_pose_buf",
+        *(f"_rpc_{name}" for name in _RPC_METHODS),
+    )
+
     def __init__(self, config: BaseBackendConfig, dry_run: bool = False) -> None:
         self._cfg = config
         self._dry_run = dry_run
+        # Packed once so reconnects (e.g. after arm recovery) don't rebuild them
+        self._address = (config.host, config.port)
+        self._authkey = bytes(config.authkey)
         self._manager: _BaseManager | None = None
         self._base: Any = None
-        self._connected = False
+        self._bind_rpc(None)
 
         # Commanded velocity tracking for collision detection
-        self._last_cmd_vel: list[float] = [0.0, 0.0, 0.0]  # [vx, vy, wz]
+        self._last_cmd_vel: tuple[float, float, float] = (0.0, 0.0, 0.0)  # (vx, vy, wz)
         self._last_cmd_time: float = 0.0
         self._cmd_is_velocity: bool = False
 
+        # Reused target buffer for execute_action; the manager proxy pickles
+        # arguments by value before the call returns, so reuse is safe
+        self._pose_buf = np.empty(3, dtype=np.float64)
+
     # -- lifecycle -----------------------------------------------------------
 
-    async def connect(self) -> None:
+    def connect(self) -> None:
         if self._dry_run:
             logger.info("BaseBackend: dry-run mode, skipping connection")
             return
-        self._manager = _BaseManager(
-            address=(self._cfg.host, self._cfg.port),
-            authkey=self._cfg.authkey,
-        )
+        # Reuse the manager across transient connection losses
+        if self._manager is None:
+            self._manager = _BaseManager(address=self._address, authkey=self._authkey)
         self._manager.connect()
         self._base = self._manager.Base()  # type: ignore[attr-defined]
+        self._bind_rpc(self._base)
         # Initialize the vehicle if not already running (safe if controller already started)
         self._base.ensure_initialized()
         logger.info("BaseBackend: connected to %s:%d", self._cfg.host, self._cfg.port)
 
-    async def disconnect(self) -> None:
-        self._base = None
+    def disconnect(self) -> None:
+        self._bind_rpc(None)
         self._manager = None
         logger.info("BaseBackend: disconnected")
 
+    def _bind_rpc(self, base: Any) -> None:
+        """Cache (or clear) the proxy's bound methods as ``_rpc_<name>``."""
+        self._base = base
+        for name in _RPC_METHODS:
+            setattr(self, f"_rpc_{name}", None if base is None else getattr(base, name))
+
     @property
     def is_connected(self) -> bool:
         """Return True if connected to base server."""
@@ -70,8 +95,9 @@ class BaseBackend:
     # -- queries -------------------------------------------------------------
 
     @property
-    def last_cmd_vel(self) -> list[float]:
-        return list(self._last_cmd_vel)
+    def last_cmd_vel(self) -> tuple[float, float, float]:
+        # Immutable and replaced wholesale on update, so no copy is needed
+        return self._last_cmd_vel
 
     @property
     def last_cmd_time(self) -> float:
@@ -89,63 +115,65 @@ class BaseBackend:
         """
         if self._dry_run:
             return {"base_pose": [0.0, 0.0, 0.0], "base_velocity": [0.0, 0.0, 0.0]}
-        if self._base is None:
-            raise BaseBackendError("Base backend not connected")
-        try:
-            raw = self._base.get_state()
-        except (BrokenPipeError, EOFError, ConnectionResetError, OSError) as e:
-            self._base = None  # Mark as disconnected
-            raise BaseBackendError(f"Connection to base_server lost: {e}") from e
+        raw = self._call_base(self._rpc_get_state)
+        # BaseServer (outside this repo) sends ndarrays; exact type checks are
+        # cheaper than isinstance for this monomorphic case, and lists pass
+        # through untouched
         pose = raw.get("base_pose")
-        if isinstance(pose, np.ndarray):
+        if type(pose) is np.ndarray:
             pose = pose.tolist()
-        velocity = raw.get("base_velocity", [0.0, 0.0, 0.0])
-        if isinstance(velocity, np.ndarray):
+        velocity = raw.get("base_velocity")
+        if velocity is None:
+            velocity = [0.0, 0.0, 0.0]
+        elif type(velocity) is np.ndarray:
             velocity = velocity.tolist()
         return {"base_pose": pose, "base_velocity": velocity}
 
     # -- commands ------------------------------------------------------------
 
-    def _call_base(self, method_name: str, *args, **kwargs):
-        """Call a method on the base proxy, handling connection errors.
+    def _call_base(self, method, *args, **kwargs):
+        """Call a cached ``_rpc_*`` proxy method, handling connection errors.
 
         Raises:
             BaseBackendError: If the connection to base_server is broken.
         """
-        if self._base is None:
+        if method is None:
             raise BaseBackendError("Base backend not connected")
         try:
-            method = getattr(self._base, method_name)
             return method(*args, **kwargs)
-        except (BrokenPipeError, EOFError, ConnectionResetError, OSError) as e:
-            self._base = None  # Mark as disconnected
+        except _CONNECTION_ERRORS as e:
+            self._bind_rpc(None)  # Mark as disconnected
             raise BaseBackendError(f"Connection to base_server lost: {e}") from e
 
     def execute_action(self, x: float, y: float, theta: float) -> None:
         if self._dry_run:
             return
         self._cmd_is_velocity = False
-        self._last_cmd_vel = [0.0, 0.0, 0.0]
-        self._call_base("execute_action", {"base_pose": np.array([x, y, theta])})
+        self._last_cmd_vel = (0.0, 0.0, 0.0)
+        buf = self._pose_buf
+        buf[0] = x
+        buf[1] = y
+        buf[2] = theta
+        self._call_base(self._rpc_execute_action, {"base_pose": buf})
 
     def set_target_velocity(
         self, vx: float, vy: float, wz: float, frame: str = "global"
     ) -> None:
         if self._dry_run:
             return
-        self._last_cmd_vel = [vx, vy, wz]
+        self._last_cmd_vel = (vx, vy, wz)
         self._last_cmd_time = time.time()
         self._cmd_is_velocity = True
-        self._call_base("set_target_velocity", [vx, vy, wz], frame=frame)
+        self._call_base(self._rpc_set_target_velocity, [vx, vy, wz], frame=frame)
 
     def stop(self) -> None:
         if self._dry_run:
             return
         self._cmd_is_velocity = False
-        self._last_cmd_vel = [0.0, 0.0, 0.0]
-        self._call_base("stop")
+        self._last_cmd_vel = (0.0, 0.0, 0.0)
+        self._call_base(self._rpc_stop)
 
     def reset(self) -> None:
         if self._dry_run:
             return
-        self._call_base("reset")
+        self._call_base(self._rpc_reset)
@@ -3,37 +3,116 @@
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
+import functools
 import logging
+import os
 import sys
 import threading
+import struct
 import time
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Callable, Iterator
 
-# Add camera_server to path
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'camera_server'))
-
-try:
-    from camera_server.client import CameraClient, DecodedFrame
-    from camera_server.protocol import CameraStateMsg, CameraInfo
-    CAMERA_CLIENT_AVAILABLE = True
-except ImportError:
-    CAMERA_CLIENT_AVAILABLE = False
-    CameraClient = None
-    DecodedFrame = None
-    CameraStateMsg = None
-    CameraInfo = None
-
-try:
-    import cv2
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
+import numpy as np
 
 from config import CameraBackendConfig
 
 logger = logging.getLogger(__name__)
 
+# camera_server's client pulls in websockets/opencv, and cv2 alone can take
+# 100+ ms to import, so these are loaded by CameraBackend.start() rather than
+# at import time; dry-run and camera-less processes never pay for them.
+_CAMERA_SERVER_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), '..', '..', 'camera_server')
+)
+CameraClient = None
+DecodedFrame = None
+CAMERA_CLIENT_AVAILABLE: Optional[bool] = None  # None until _load_client()
+
+cv2 = None
+CV2_AVAILABLE = False
+# libjpeg-turbo (SIMD) encoder; returns bytes directly. Color only, depth
+# PNGs go through zlib-ng or cv2.
+simplejpeg = None
+SIMPLEJPEG_AVAILABLE = False
+# zlib-ng (SIMD deflate/CRC) for single-channel depth PNGs; cv2 otherwise
+zlib_ng = None
+ZLIB_NG_AVAILABLE = False
+_encoders_loaded = False
+
+# GPU encoder (PyNvJpeg), imported on demand since it loads CUDA
+_NvJpeg = None
+
+
+def _load_client() -> bool:
+    """Import camera_server's client on first use; return availability."""
+    global CameraClient, DecodedFrame, CAMERA_CLIENT_AVAILABLE
+    if CAMERA_CLIENT_AVAILABLE is None:
+        if _CAMERA_SERVER_PATH not in sys.path:
+            sys.path.insert(0, _CAMERA_SERVER_PATH)
+        try:
+            from camera_server.client import CameraClient, DecodedFrame
+            CAMERA_CLIENT_AVAILABLE = True
+        except ImportError:
+            CAMERA_CLIENT_AVAILABLE = False
+    return CAMERA_CLIENT_AVAILABLE
+
+
+def _load_encoders() -> None:
+    """Import the optional CPU image encoders on first use."""
+    global cv2, CV2_AVAILABLE, simplejpeg, SIMPLEJPEG_AVAILABLE
+    global zlib_ng, ZLIB_NG_AVAILABLE, _encoders_loaded
+    if _encoders_loaded:
+        return
+    try:
+        import cv2
+        CV2_AVAILABLE = True
+    except ImportError:
+        CV2_AVAILABLE = False
+    try:
+        import simplejpeg
+        SIMPLEJPEG_AVAILABLE = True
+    except ImportError:
+        SIMPLEJPEG_AVAILABLE = False
+    try:
+        from zlib_ng import zlib_ng
+        ZLIB_NG_AVAILABLE = True
+    except ImportError:
+        ZLIB_NG_AVAILABLE = False
+    _encoders_loaded = True
+
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_IEND = b"\x00\x00\x00\x00IEND\xaeB`\x82"
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib_ng.crc32(tag + data))
+
+
+def _encode_png_gray(image: np.ndarray) -> bytes:
+    """Encode a 2-D uint8/uint16 image as a grayscale PNG using zlib-ng.
+
+    Rows use filter type 0 and fast deflate, which is what cv2 does by
+    default for depth; only the deflate/CRC implementation differs.
+    """
+    height, width = image.shape
+    if image.dtype == np.uint16:
+        bit_depth = 16
+        image = image.astype(">u2", copy=False)  # PNG samples are big-endian
+    else:
+        bit_depth = 8
+    # Each scanline is prefixed with its filter-type byte (0 = none)
+    rows = np.zeros((height, 1 + width * image.itemsize), dtype=np.uint8)
+    rows[:, 1:] = np.ascontiguousarray(image).view(np.uint8).reshape(height, -1)
+    ihdr = struct.pack(">IIBBBBB", width, height, bit_depth, 0, 0, 0, 0)
+    return b"".join((
+        _PNG_SIGNATURE,
+        _png_chunk(b"IHDR", ihdr),
+        _png_chunk(b"IDAT", zlib_ng.compress(rows, 1)),
+        _PNG_IEND,
+    ))
+
 
 class CameraBackendError(Exception):
     """Raised when camera backend is unavailable or connection fails."""
@@ -47,17 +126,54 @@ class CameraBackend:
     Follows the same pattern as BaseBackend/FrankaBackend.
     """
 
+    # Skip encoding a device's frames if nobody has read it for this long
+    DEMAND_TIMEOUT = 2.0
+    _DEMAND_TIMEOUT_NS = int(DEMAND_TIMEOUT * 1e9)
+    # Boundary for multipart/mixed responses built by iter_multipart()
+    MULTIPART_BOUNDARY = "tidybot-frame"
+
     def __init__(self, config: CameraBackendConfig, dry_run: bool = False) -> None:
         self._cfg = config
         self._dry_run = dry_run
         self._client: Optional[CameraClient] = None
         self._connected = False
         self._streaming = False
+        self._encoder: Optional[str] = None  # resolved by start()
+        self._nvjpeg_local = threading.local()  # one nvJPEG encoder state per thread
+        # quality -> specialized ``image -> JPEG bytes`` (see _make_encoder)
+        self._encoders: Dict[int, Callable[[Any], Optional[bytes]]] = {}
         
-        # Frame cache for HTTP endpoint: device_id -> (JPEG bytes, timestamp)
-        self._frame_cache: Dict[str, tuple] = {}  # device_id -> (bytes, float)
-        self._frame_lock = threading.Lock()
-        self._frame_max_age = 2.0  # seconds before considering cached frame stale
+        # Color JPEG cache for HTTP endpoints: device_id -> (bytes, monotonic
+        # ns). Depth is not pre-encoded; its readers PNG-encode the client's
+        # latest frame on request (encode_depth_png).
+        # Entries are immutable bytes handed to responses by reference, so
+        # encode buffers are deliberately not pooled/reused: a recycled
+        # buffer could be overwritten while a response is still sending it.
+        self._color_cache: Dict[str, tuple] = {}  # device_id -> (bytes, int)
+        self._frame_lock = threading.Lock()  # serializes snapshot rebuilds only
+        # Immutable ((device_id, JPEG bytes, monotonic ns), ...) of color
+        # entries, swapped by writers so get_all_frames is a single reference
+        # load
+        self._snapshot: tuple = ()
+        self._mime_headers: Dict[str, bytes] = {}  # device_id -> multipart part header
+        # Cache/read timestamps are time.monotonic_ns() ints: the vDSO clock
+        # avoids a syscall and staleness checks are plain int compares
+        self._frame_max_age_ns = int(config.frame_max_age * 1e9)
+
+        # Encoding runs off the client's recv thread. Each device has a
+        # single pending slot (newest frame wins) and at most one job in
+        # flight, so a slow encoder drops frames instead of queueing them.
+        self._encode_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._pending: Dict[str, tuple] = {}  # device_id -> (DecodedFrame, int)
+        self._encoding: set = set()  # device_ids with an encode job in flight
+        self._pending_lock = threading.Lock()
+
+        # Consumer demand: encode only while someone is reading frames
+        self._last_read: Dict[str, int] = {}  # device_id -> last get_frame time (ns)
+        self._last_read_any = 0  # last read not tied to one device (ns)
+
+        # Last on-demand encode per (device_id, quality) -> (DecodedFrame, JPEG bytes)
+        self._shared_jpeg: Dict[tuple, tuple] = {}
 
         # Intrinsics cache (fetched once at startup, before streaming thread)
         self._intrinsics_cache: Dict[str, Dict[str, Any]] = {}  # device_id -> intrinsics
@@ -74,9 +190,14 @@ class CameraBackend:
             logger.info("CameraBackend: disabled in config")
             return
         
-        if not CAMERA_CLIENT_AVAILABLE:
+        if not _load_client():
             logger.error("CameraBackend: camera_server client not available")
             return
+
+        if self._encoder is None:
+            _load_encoders()
+            self._encoder = self._resolve_encoder(self._cfg.encoder)
+            self._encoders.clear()
         
         try:
             self._client = CameraClient(
@@ -97,6 +218,14 @@ class CameraBackend:
             # (streaming starts a recv thread that races with synchronous calls)
             self._cache_intrinsics()
 
+            # cv2/libjpeg release the GIL while encoding. One worker per
+            # camera means every device's drain job starts immediately, so a
+            # pending slot is never stuck behind another camera's backlog.
+            n_cameras = len(self._client.latest_state.cameras) if self._client.latest_state else 0
+            self._encode_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(2, n_cameras), thread_name_prefix="jpeg-enc",
+            )
+
             # Set up frame callback for caching
             self._client.set_frame_callback(self._on_frame)
 
@@ -116,16 +245,27 @@ class CameraBackend:
             logger.error("CameraBackend: connection failed: %s", e)
             self._client = None
             self._connected = False
+            if self._encode_pool is not None:
+                self._encode_pool.shutdown(wait=False, cancel_futures=True)
+                self._encode_pool = None
 
     async def stop(self) -> None:
         """Disconnect from camera server."""
-        if self._client:
+        client, self._client = self._client, None
+        self._connected = False
+        if client:
+            # Socket teardown and recv-thread join block; keep them off the loop
             try:
-                self._client.disconnect()
+                await asyncio.to_thread(client.disconnect)
             except Exception as e:
                 logger.error("CameraBackend: error disconnecting: %s", e)
-            self._client = None
-        self._connected = False
+        if self._encode_pool is not None:
+            self._encode_pool.shutdown(wait=False, cancel_futures=True)
+            self._encode_pool = None
+        with self._pending_lock:
+            self._pending.clear()
+            self._encoding.clear()
+        self._shared_jpeg.clear()
         self._streaming = False
         logger.info("CameraBackend: disconnected")
 
@@ -156,96 +296,311 @@ class CameraBackend:
     # -- frame callback ------------------------------------------------------
 
     def _on_frame(self, frame: DecodedFrame) -> None:
-        """Callback for received frames - cache as JPEG (color) or PNG (depth)."""
-        if not CV2_AVAILABLE:
+        """Callback for received frames - hand color frames to the encode pool.
+
+        Runs on the client's recv thread, so it only parks the frame in its
+        pending slot and schedules an encode job if none is running for that
+        device. The slot holds one frame: an unencoded older frame is simply
+        replaced (drop-oldest), so memory stays bounded and the encoder
+        always works on the newest frame however far it falls behind.
+        """
+        if frame.stream_type != "color":
+            return
+        key = frame.device_id
+
+        # Nobody polling this device: don't spend CPU on frames no one will
+        # read. The first read after an idle spell finds the cache stale and
+        # re-encodes the client's latest frame; the read also restarts encoding.
+        now = time.monotonic_ns()
+        last_read = max(self._last_read.get(key, 0), self._last_read_any)
+        if now - last_read > self._DEMAND_TIMEOUT_NS:
             return
 
+        pool = self._encode_pool
+        if pool is None:
+            return
+        with self._pending_lock:
+            self._pending[key] = (frame, now)
+            if key in self._encoding:
+                return
+            self._encoding.add(key)
         try:
-            now = time.time()
-            if frame.stream_type == "color":
-                encode_params = [cv2.IMWRITE_JPEG_QUALITY, self._cfg.quality]
-                _, jpeg = cv2.imencode(".jpg", frame.frame, encode_params)
-                with self._frame_lock:
-                    self._frame_cache[frame.device_id] = (jpeg.tobytes(), now)
-            elif frame.stream_type == "depth":
-                _, png = cv2.imencode(".png", frame.frame)
-                with self._frame_lock:
-                    self._frame_cache[f"{frame.device_id}:depth"] = (png.tobytes(), now)
-        except Exception as e:
-            logger.error("CameraBackend: error encoding frame: %s", e)
+            pool.submit(self._encode_pending, key)
+        except RuntimeError:
+            # Pool shut down by stop() while the recv thread was delivering
+            with self._pending_lock:
+                self._encoding.discard(key)
+
+    def _encode_pending(self, device_id: str) -> None:
+        """Encode pool job: drain a device's pending slot into the frame cache."""
+        while True:
+            with self._pending_lock:
+                item = self._pending.pop(device_id, None)
+                if item is None:
+                    self._encoding.discard(device_id)
+                    return
+            frame, now = item
+            try:
+                data = self._encode_jpeg(frame.frame)
+            except Exception as e:
+                logger.error("CameraBackend: error encoding frame: %s", e)
+                continue
+            if data is not None:
+                self._store_frame(device_id, data, now)
+
+    def _store_frame(self, device_id: str, data: bytes, now: int) -> None:
+        """Publish a newly encoded frame and rebuild the snapshot.
+
+        Each entry has a single writer and is one dict store, which
+        is atomic under the GIL, so the store itself takes no lock. Only the
+        snapshot rebuild is serialized: since every writer stores before it
+        takes the lock, whichever rebuild runs last sees all stores.
+        """
+        self._color_cache[device_id] = (data, now)
+        with self._frame_lock:
+            self._snapshot = tuple(
+                (k, *v) for k, v in tuple(self._color_cache.items())
+            )
+
+    @staticmethod
+    def _resolve_encoder(name: str) -> Optional[str]:
+        """Pick the JPEG encoder to use, falling back to what is installed."""
+        global _NvJpeg
+        if name == "nvjpeg":
+            try:
+                from nvjpeg import NvJpeg
+                NvJpeg()  # fails here if there is no usable CUDA device
+                _NvJpeg = NvJpeg
+                return "nvjpeg"
+            except Exception as e:
+                logger.warning("CameraBackend: nvjpeg unavailable (%s), using CPU encoder", e)
+        if name != "opencv" and SIMPLEJPEG_AVAILABLE:
+            return "simplejpeg"
+        if CV2_AVAILABLE:
+            return "opencv"
+        return None
+
+    def encode_depth_png(self, image) -> Optional[bytes]:
+        """Encode a depth image to PNG bytes, or None without an encoder."""
+        if (ZLIB_NG_AVAILABLE and image.ndim == 2
+                and image.dtype in (np.uint16, np.uint8)):
+            return _encode_png_gray(image)
+        if not CV2_AVAILABLE:
+            return None
+        _, png = cv2.imencode(".png", image)
+        return png.tobytes()
+
+    def _make_encoder(self, quality: int) -> Callable[[Any], Optional[bytes]]:
+        """Build an ``image -> JPEG bytes`` function for one quality.
+
+        The encoder choice, quality and option arguments are bound once here,
+        so the per-frame call does no dispatch or argument building.
+        """
+        encoder = self._encoder
+        contiguous = np.ascontiguousarray  # no-op for the usual C-contiguous frame
+        if encoder == "simplejpeg":
+            encode = functools.partial(
+                simplejpeg.encode_jpeg, quality=quality, colorspace="BGR", fastdct=True,
+            )
+            return lambda image: encode(contiguous(image))
+        if encoder == "nvjpeg":
+            local = self._nvjpeg_local
+
+            def encode_nvjpeg(image):
+                # nvJPEG encoder state is not thread-safe; keep one per encode thread
+                nj = getattr(local, "encoder", None)
+                if nj is None:
+                    nj = local.encoder = _NvJpeg()
+                return nj.encode(contiguous(image), quality)
+            return encode_nvjpeg
+        if encoder == "opencv":
+            imencode = cv2.imencode
+            params = [int(cv2.IMWRITE_JPEG_QUALITY), int(quality)]
+
+            def encode_cv2(image):
+                _, jpeg = imencode(".jpg", image, params)
+                return jpeg.tobytes()
+            return encode_cv2
+        return lambda image: None
+
+    def _encode_jpeg(self, image, quality: Optional[int] = None) -> Optional[bytes]:
+        """Encode a BGR image to JPEG bytes with the configured encoder.
+
+        Returns None if no encoder is installed.
+        """
+        if quality is None:
+            quality = self._cfg.quality
+        encode = self._encoders.get(quality)
+        if encode is None:
+            if self._encoder is None:
+                return None  # encoders are resolved by start()
+            encode = self._encoders[quality] = self._make_encoder(quality)
+        return encode(image)
 
     # -- queries -------------------------------------------------------------
 
-    def _encode_decoded_frame(self, decoded: "DecodedFrame") -> Optional[bytes]:
-        """Encode a DecodedFrame to JPEG bytes."""
-        if not CV2_AVAILABLE or decoded is None:
+    def encode_decoded_frame(
+        self,
+        decoded: "DecodedFrame",
+        quality: Optional[int] = None,
+    ) -> Optional[bytes]:
+        """Encode a color DecodedFrame to JPEG bytes, shared across callers.
+
+        WebSocket subscribers and the get_frame fallback all encode whatever
+        get_latest_decoded_frame returned, which is the same object until the
+        client receives the next frame. The last result per (device, quality)
+        is kept, so each frame is color-converted and compressed once rather
+        than once per consumer.
+
+        Args:
+            decoded: Frame from get_latest_decoded_frame
+            quality: JPEG quality (default: from config)
+
+        Returns:
+            JPEG bytes or None
+        """
+        if decoded is None:
             return None
+        if quality is None:
+            quality = self._cfg.quality
+        key = (decoded.device_id, quality)
+        shared = self._shared_jpeg.get(key)
+        if shared is not None and shared[0] is decoded:
+            return shared[1]
         try:
-            encode_params = [cv2.IMWRITE_JPEG_QUALITY, self._cfg.quality]
-            _, jpeg = cv2.imencode(".jpg", decoded.frame, encode_params)
-            return jpeg.tobytes()
+            jpeg = self._encode_jpeg(decoded.frame, quality)
         except Exception as e:
             logger.error("CameraBackend: error encoding frame: %s", e)
             return None
+        if jpeg is not None:
+            # Holding the frame keeps its id from being reused by a new one
+            self._shared_jpeg[key] = (decoded, jpeg)
+        return jpeg
 
     def get_frame(self, device: Optional[str] = None) -> Optional[bytes]:
         """Get latest frame as JPEG bytes.
 
         Returns a fresh frame from the streaming cache. If the cached frame
-        is stale (older than _frame_max_age), falls back to the CameraClient's
+        is stale (older than frame_max_age), falls back to the CameraClient's
         own frame buffer and re-encodes on the fly.
 
         Args:
             device: Device ID, or None for first available
 
         Returns:
-            JPEG bytes or None
+            JPEG bytes or None. Cached frames are returned by reference, not
+            copied; they are immutable, so they stay valid after newer frames
+            replace them and can go straight into a Response.
         """
         if self._dry_run:
             return None
 
-        now = time.time()
-
-        # Try cached pre-encoded frame (from streaming callback)
-        with self._frame_lock:
-            if device:
-                entry = self._frame_cache.get(device)
-                if entry:
-                    data, ts = entry
-                    if now - ts < self._frame_max_age:
-                        return data
-            else:
-                for key, entry in self._frame_cache.items():
-                    if ":" in key:  # skip depth entries (device_id:depth)
-                        continue
-                    data, ts = entry
-                    if now - ts < self._frame_max_age:
-                        return data
+        now = time.monotonic_ns()
+        if device:
+            self._last_read[device] = now
+        else:
+            self._last_read_any = now
+
+        # Try cached pre-encoded frame (from streaming callback). Read
+        # without the lock: each entry is one (bytes, ts) tuple replaced by
+        # a single dict store, so a reader sees either the old or the new
+        # frame, never a torn pair.
+        if device:
+            entry = self._color_cache.get(device)
+            if entry:
+                data, ts = entry
+                if now - ts < self._frame_max_age_ns:
+                    return data
+        else:
+            # tuple() snapshots the values in one C call, so a writer adding
+            # a device can't invalidate the iteration
+            for data, ts in tuple(self._color_cache.values()):
+                if now - ts < self._frame_max_age_ns:
+                    return data
 
         # Cache is stale or empty — fall back to CameraClient's latest_frames
-        # (updated directly by recv thread, no extra callback needed).
-        # Note: DecodedFrame.timestamp is RealSense hardware time, not system time,
-        # so we can't compare it with time.time(). Just use whatever the client has.
+        jpeg = self._client_frame_jpeg(device)
+        if jpeg:
+            return jpeg
+
+        logger.debug("CameraBackend: no fresh frame available for device=%s", device)
+        return None
+
+    def _client_frame_jpeg(self, device: Optional[str]) -> Optional[bytes]:
+        """Encode the CameraClient's latest color frame for ``device``.
+
+        latest_frames is updated directly by the recv thread, so it is current
+        even while the cache is not being fed. Note: DecodedFrame.timestamp is
+        RealSense hardware time, not system time, so we can't compare it with
+        our clock. Just use whatever the client has.
+        """
         if self._client and self._connected:
             decoded = self._client.get_latest_frame("color", device)
             if decoded is not None:
                 logger.debug("CameraBackend: using CameraClient fallback frame for device=%s", device)
-                jpeg = self._encode_decoded_frame(decoded)
-                if jpeg:
-                    return jpeg
-
-        logger.debug("CameraBackend: no fresh frame available for device=%s", device)
+                return self.encode_decoded_frame(decoded)
         return None
 
+    def _fresh_frames(self) -> List[tuple]:
+        """Return ``[(device_id, JPEG bytes), ...]`` for every color camera.
+
+        Snapshot entries older than frame_max_age (encoding pauses while
+        nobody reads) are re-encoded from the client, or left out if it has
+        no frame. Cameras with no cache entry yet (nothing has read them
+        since startup) are encoded from the client the same way. Counts as
+        a read of every device, so encoding resumes.
+        """
+        now = time.monotonic_ns()
+        self._last_read_any = now
+        max_age = self._frame_max_age_ns
+        snapshot = self._snapshot
+        frames = []
+        for device_id, data, ts in snapshot:
+            if now - ts >= max_age:
+                data = self._client_frame_jpeg(device_id)
+                if not data:
+                    continue
+            frames.append((device_id, data))
+
+        client = self._client
+        state = client.latest_state if client is not None else None
+        if state is not None and len(state.cameras) > len(snapshot):
+            cached = {entry[0] for entry in snapshot}
+            for cam in state.cameras:
+                if cam.device_id not in cached:
+                    data = self._client_frame_jpeg(cam.device_id)
+                    if data:
+                        frames.append((cam.device_id, data))
+        return frames
+
     def get_all_frames(self) -> Dict[str, bytes]:
-        """Get all cached color frames (bytes only, no timestamps).
+        """Get all fresh color frames (bytes only, no timestamps).
 
         Returns:
-            Dict of device_id -> JPEG bytes
+            Dict of device_id -> JPEG bytes (shared with the cache, not copied)
         """
-        with self._frame_lock:
-            return {k: v[0] for k, v in self._frame_cache.items()
-                    if ":" not in k}  # exclude depth entries (device_id:depth)
+        return dict(self._fresh_frames())
+
+    def iter_multipart(self) -> Iterator[bytes]:
+        """Yield a multipart/mixed body of all fresh color frames.
+
+        Per-device part headers are built once and JPEGs are yielded by
+        reference, so ``b"".join(...)`` assembles the whole response with a
+        single copy and it goes out in one send.
+        """
+        headers = self._mime_headers
+        for device_id, jpeg in self._fresh_frames():
+            header = headers.get(device_id)
+            if header is None:
+                header = headers[device_id] = (
+                    f"--{self.MULTIPART_BOUNDARY}\r\n"
+                    f"Content-Type: image/jpeg\r\n"
+                    f"X-Device-Id: {device_id}\r\n\r\n"
+                ).encode()
+            yield header
+            yield jpeg
+            yield b"\r\n"
+        yield f"--{self.MULTIPART_BOUNDARY}--\r\n".encode()
 
     def get_state(self) -> Optional[Dict[str, Any]]:
         """Get camera state.
@@ -391,3 +746,11 @@ class CameraBackend:
         except Exception as e:
             logger.error("CameraBackend: unsubscribe error: %s", e)
             return False
+
+    # -- async wrappers ------------------------------------------------------
+    # get_state is a blocking RPC to camera_server; from async handlers use
+    # this so a slow camera never stalls the event loop.
+
+    async def get_state_async(self) -> Optional[Dict[str, Any]]:
+        """``get_state`` run in a worker thread."""
+        return await asyncio.to_thread(self.get_state)
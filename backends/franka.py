@@ -2,7 +2,12 @@
 
 from __future__ import annotations
 
+import json
 import logging
+import operator
+import os
+import sys
+import threading
 import time
 from typing import Any
 
@@ -10,68 +15,161 @@ import numpy as np
 
 from config import FrankaBackendConfig
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+_FRANKA_PKG_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "franka_interact", "franka_server")
+)
+_FrankaClient = None  # franka_server.client.FrankaClient once imported
+
+
+def _load_franka_client():
+    """Import FrankaClient on first connect and cache it for reconnects.
+
+    Deferred so the server can start without the franka_server package
+    in dry-run mode.
+    """
+    global _FrankaClient
+    if _FrankaClient is None:
+        if _FRANKA_PKG_PATH not in sys.path:
+            sys.path.insert(0, _FRANKA_PKG_PATH)
+        from franka_server.client import FrankaClient
+        _FrankaClient = FrankaClient
+    return _FrankaClient
+
+
+# Client commands dispatched through ``_cmd_<name>``, bound by _bind_commands
+_COMMANDS = (
+    "send_joint_position", "send_cartesian_pose", "set_gains", "send_joint_velocity",
+    "send_cartesian_velocity", "set_control_mode", "emergency_stop",
+)
+
+
+# FrankaState fields read by get_state, fetched in one C call
+_get_state_fields = operator.attrgetter("q", "dq", "O_T_EE", "O_F_ext_hat_K", "control_mode")
+
+
+def _dry_run_ok(*args, **kwargs) -> bool:
+    return True
+
+
+def _not_connected(*args, **kwargs) -> bool:
+    raise FrankaBackendError("Franka backend not connected")
+
+
+def _to_list(values) -> list:
+    """Convert a state field to a list, in C when it is an ndarray.
+
+    ``ndarray.tolist()`` builds the floats in one C loop; ``list()`` boxes
+    each element through the Python iterator protocol.
+    """
+    if type(values) is np.ndarray:
+        return values.tolist()
+    return list(values)
+
+
+class FrankaBackendError(Exception):
+    """Raised when a command is sent while franka_server is not connected."""
+    pass
+
 
 class FrankaBackend:
     """Wraps FrankaClient for arm control."""
 
+    __slots__ = (
+        "_cfg", "_dry_run", "_client", "is_connected", "_last_state_count",
+        "_last_state_change_ns", "_state_lock",
+        *(f"_cmd_{name}" for name in _COMMANDS),
+    )
+
     def __init__(self, config: FrankaBackendConfig, dry_run: bool = False) -> None:
         self._cfg = config
         self._dry_run = dry_run
         self._client: Any = None
         # Staleness tracking — detect when franka_server stops publishing
-        self._last_state_q: list | None = None  # last observed q values
-        self._last_state_change_time: float = 0.0  # wall-clock time q last changed
+        self._last_state_count = -1  # last observed ZMQ _state_count; -1 = none yet
+        self._last_state_change_ns = 0  # time.monotonic_ns() count last advanced; 0 = never
+        # The poll thread, GET /state/arm and ArmMonitor (both on the event
+        # loop) all update the two fields above
+        self._state_lock = threading.Lock()
+        self._bind_commands(None)
+
+    def _reset_state_tracking(self) -> None:
+        """Forget the previous client's counter so it can't vouch for a new one."""
+        with self._state_lock:
+            self._last_state_count = -1
+            self._last_state_change_ns = 0
 
     # -- lifecycle -----------------------------------------------------------
 
-    async def connect(self) -> None:
+    def connect(self) -> None:
         if self._dry_run:
             logger.info("FrankaBackend: dry-run mode, skipping connection")
             return
 
-        # Import here so the server can start even without franka_server package
-        # when in dry-run mode.
-        import sys, os
-
-        franka_pkg = os.path.join(
-            os.path.dirname(__file__),
-            "..",
-            "..",
-            "franka_interact",
-            "franka_server",
-        )
-        if franka_pkg not in sys.path:
-            sys.path.insert(0, os.path.abspath(franka_pkg))
-
-        from franka_server.client import FrankaClient
-
-        self._client = FrankaClient(
+        self._client = _load_franka_client()(
             server_ip=self._cfg.host,
             cmd_port=self._cfg.cmd_port,
             state_port=self._cfg.state_port,
             stream_port=self._cfg.stream_port,
         )
         self._client.start()
+        self._reset_state_tracking()
+        self._bind_commands(self._client)
 
         logger.info("FrankaBackend: connected to %s", self._cfg.host)
 
-    async def disconnect(self) -> None:
+    def disconnect(self) -> None:
         if self._client is not None:
             self._client.stop()
             self._client = None
+            self._bind_commands(None)
+        self._reset_state_tracking()
         logger.info("FrankaBackend: disconnected")
 
+    def _bind_commands(self, client: Any) -> None:
+        """Point each ``_cmd_<name>`` at the client's method.
+
+        Resolved once per (dis)connect so command calls skip the dry-run
+        branch and the ``self._client.<name>`` lookup. Also updates
+        ``is_connected``, a plain attribute so health checks and the state
+        poll read it without a property call.
+        """
+        self.is_connected = self._dry_run or client is not None
+        for name in _COMMANDS:
+            if self._dry_run:
+                fn = _dry_run_ok
+            elif client is None:
+                fn = _not_connected
+            else:
+                fn = getattr(client, name)
+            setattr(self, f"_cmd_{name}", fn)
+
     @property
-    def is_connected(self) -> bool:
-        """Return True if connected to franka server."""
-        return self._dry_run or self._client is not None
+    def last_state_time(self) -> float | None:
+        """``time.monotonic()`` at which the ZMQ state stream last advanced.
+
+        Reads the client's ``_state_count`` itself, so ArmMonitor sees the
+        stream's liveness whether or not anything is polling ``get_state``.
+        ``None`` until the first message since (re)connecting.
+        """
+        client = self._client
+        if client is not None:
+            self._observe_state_count(client)
+        ns = self._last_state_change_ns
+        return ns / 1e9 if ns else None
 
     # -- state ---------------------------------------------------------------
 
     # If state_count hasn't changed for this long, state is stale
     STATE_STALE_TIMEOUT = 2.0
+    STATE_STALE_TIMEOUT_NS = int(STATE_STALE_TIMEOUT * 1e9)
 
     def get_state(self) -> dict:
         """Return arm state as a plain dict.
@@ -87,70 +185,102 @@ class FrankaBackend:
                 "ee_wrench": [0.0] * 6,
                 "control_mode": 0,
             }
-        if self._client is None:
-            return {}
-        state = self._client.latest_state
+        state = self._fresh_state()
         if state is None:
             return {}
+        q, dq, ee_pose, ee_wrench, control_mode = _get_state_fields(state)
+        return {
+            "q": _to_list(q),
+            "dq": _to_list(dq),
+            "ee_pose": _to_list(ee_pose),
+            "ee_wrench": _to_list(ee_wrench),
+            "control_mode": int(control_mode),
+        }
 
-        q = list(state.q)
-        now = time.time()
+    def get_state_json(self) -> bytes:
+        """Return ``get_state()`` serialized as JSON bytes.
+
+        With orjson installed the state arrays are serialized straight from
+        their numpy buffers, skipping the intermediate Python lists.
+        """
+        if self._dry_run or not ORJSON_AVAILABLE:
+            return json.dumps(self.get_state()).encode()
+        state = self._fresh_state()
+        if state is None:
+            return b"{}"
+        q, dq, ee_pose, ee_wrench, control_mode = _get_state_fields(state)
+        return orjson.dumps(
+            {
+                "q": q,
+                "dq": dq,
+                "ee_pose": ee_pose,
+                "ee_wrench": ee_wrench,
+                "control_mode": int(control_mode),
+            },
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+    def _fresh_state(self) -> Any:
+        """Return the client's latest FrankaState, or None if absent or stale."""
+        client = self._client
+        if client is None:
+            return None
+        # latest_state is swapped as a whole object by the subscriber thread,
+        # so this one reference read is already a consistent snapshot
+        state = client.latest_state
+        if state is None:
+            return None
 
         # Detect staleness: check if the ZMQ state_count is still advancing.
-        # The client increments _state_count on every received message.
         # If the count hasn't changed, the subscriber isn't getting updates.
-        current_count = getattr(self._client, '_state_count', None)
-        if current_count is not None:
-            last_count = getattr(self, '_last_state_count', None)
-            if last_count is None or current_count != last_count:
-                # New messages are arriving
+        changed_ns = self._observe_state_count(client)
+        if changed_ns is not None and time.monotonic_ns() - changed_ns > self.STATE_STALE_TIMEOUT_NS:
+            # No new ZMQ messages for STATE_STALE_TIMEOUT seconds
+            return None
+        return state
+
+    def _observe_state_count(self, client: Any) -> int | None:
+        """Note whether the client's ZMQ ``_state_count`` has advanced.
+
+        The client increments the counter on every received message.
+        Returns the ``time.monotonic_ns()`` of its last advance, or None
+        for an older client without a counter (no staleness check).
+        """
+        try:
+            current_count = client._state_count
+        except AttributeError:
+            return None
+        with self._state_lock:
+            if current_count != self._last_state_count:
                 self._last_state_count = current_count
-                self._last_state_change_time = now
-            elif now - self._last_state_change_time > self.STATE_STALE_TIMEOUT:
-                # No new ZMQ messages for STATE_STALE_TIMEOUT seconds
-                return {}
-
-        return {
-            "q": q,
-            "dq": list(state.dq),
-            "ee_pose": list(state.O_T_EE),
-            "ee_wrench": list(state.O_F_ext_hat_K),
-            "control_mode": int(state.control_mode),
-        }
+                # A fresh client reports 0 until its first message arrives
+                if current_count:
+                    self._last_state_change_ns = time.monotonic_ns()
+            return self._last_state_change_ns
 
     # -- arm commands --------------------------------------------------------
 
+    # np.array copies on purpose: the client may still hold the array after
+    # a non-blocking send, so a caller's ndarray is never aliased. For list
+    # input neither a dtype hint nor np.fromiter builds the array faster.
+
     def send_joint_position(self, q: list[float], blocking: bool = True) -> bool:
-        if self._dry_run:
-            return True
-        return self._client.send_joint_position(np.array(q), blocking=blocking)
+        return self._cmd_send_joint_position(np.array(q), blocking=blocking)
 
     def send_cartesian_pose(self, pose: list[float], blocking: bool = True) -> bool:
-        if self._dry_run:
-            return True
-        return self._client.send_cartesian_pose(np.array(pose), blocking=blocking)
+        return self._cmd_send_cartesian_pose(np.array(pose), blocking=blocking)
 
     def set_gains(self, **kwargs) -> bool:
-        if self._dry_run:
-            return True
-        return self._client.set_gains(**kwargs)
+        return self._cmd_set_gains(**kwargs)
 
     def send_joint_velocity(self, dq: list[float]) -> bool:
-        if self._dry_run:
-            return True
-        return self._client.send_joint_velocity(np.array(dq), blocking=True)
+        return self._cmd_send_joint_velocity(np.array(dq), blocking=True)
 
     def send_cartesian_velocity(self, velocity: list[float]) -> bool:
-        if self._dry_run:
-            return True
-        return self._client.send_cartesian_velocity(np.array(velocity), blocking=True)
+        return self._cmd_send_cartesian_velocity(np.array(velocity), blocking=True)
 
     def set_control_mode(self, mode: int) -> bool:
-        if self._dry_run:
-            return True
-        return self._client.set_control_mode(mode)
+        return self._cmd_set_control_mode(mode)
 
     def emergency_stop(self) -> bool:
-        if self._dry_run:
-            return True
-        return self._client.emergency_stop()
+        return self._cmd_emergency_stop()
@@ -3,79 +3,156 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Optional
+import operator
+import os
+import sys
+from typing import Any, NamedTuple, Optional
 
 from config import GripperBackendConfig
 
 logger = logging.getLogger(__name__)
 
+_GRIPPER_PKG_PATH = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "gripper_server")
+)
+_GripperClient = None  # gripper_server.client.GripperClient once imported
+
+
+def _load_gripper_client():
+    """Import GripperClient on first connect and cache it for reconnects."""
+    global _GripperClient
+    if _GripperClient is None:
+        if _GRIPPER_PKG_PATH not in sys.path:
+            sys.path.insert(0, _GRIPPER_PKG_PATH)
+        from gripper_server.client import GripperClient
+        _GripperClient = GripperClient
+    return _GripperClient
+
+
+class MoveResult(NamedTuple):
+    """Dry-run outcome of move/open/close.
+
+    Unpacks like the ``(position, object_detected)`` tuple the live client
+    returns, which is forwarded as-is rather than repacked.
+    """
+
+    position: int
+    object_detected: bool
+
+
+# GripperState fields exported by get_state, fetched in one C call
+_STATE_KEYS = (
+    "position", "position_mm", "is_activated", "is_moving", "object_detected",
+    "is_calibrated", "current", "current_ma", "fault_code", "fault_message",
+)
+_get_state_fields = operator.attrgetter(*_STATE_KEYS)
+
+# Dry-run state, built once; every value is immutable, so a shallow copy per
+# poll is enough to keep callers from mutating the template.
+_DRY_RUN_STATE = {
+    "position": 0,
+    "position_mm": 85.0,
+    "is_activated": True,
+    "is_moving": False,
+    "object_detected": False,
+    "is_calibrated": True,
+    "current": 0,
+    "current_ma": 0.0,
+    "fault_code": 0,
+    "fault_message": "",
+}
+
+
+def _dry_run_ok(*args, **kwargs) -> bool:
+    return True
+
+
+def _not_connected(*args, **kwargs):
+    raise GripperBackendError("Gripper backend not connected")
+
+
+_DRY_RUN_OPENED = MoveResult(0, False)
+_DRY_RUN_CLOSED = MoveResult(255, False)
+
+# Client commands dispatched through ``_cmd_<name>``, bound by _bind_commands,
+# with their dry-run stand-ins
+_DRY_RUN_COMMANDS = {
+    "activate": _dry_run_ok,
+    "move": lambda position, speed=255, force=255: MoveResult(position, False),
+    "open": lambda speed=255, force=255: _DRY_RUN_OPENED,
+    "close": lambda speed=255, force=255: _DRY_RUN_CLOSED,
+    "stop": _dry_run_ok,
+    "calibrate": _dry_run_ok,
+    "grasp": _dry_run_ok,
+}
+
+
+class GripperBackendError(Exception):
+    """Raised when a command is sent while gripper_server is not connected."""
+    pass
+
 
 class GripperBackend:
     """Wraps gripper_server.client.GripperClient."""
 
+    __slots__ = (
+        "_cfg", "_dry_run", "_client", "is_connected",
+        *(f"_cmd_{name}" for name in _DRY_RUN_COMMANDS),
+    )
+
     def __init__(self, config: GripperBackendConfig, dry_run: bool = False) -> None:
         self._cfg = config
         self._dry_run = dry_run
         self._client: Any = None
+        self._bind_commands(None)
 
     # -- lifecycle -----------------------------------------------------------
 
-    async def connect(self) -> None:
+    def connect(self) -> None:
         if self._dry_run:
             logger.info("GripperBackend: dry-run mode, skipping connection")
             return
 
-        import sys
-        import os
-
-        gripper_pkg = os.path.join(
-            os.path.dirname(__file__),
-            "..",
-            "..",
-            "gripper_server",
-        )
-        if gripper_pkg not in sys.path:
-            sys.path.insert(0, os.path.abspath(gripper_pkg))
-
-        from gripper_server.client import GripperClient
-
-        self._client = GripperClient(
+        self._client = _load_gripper_client()(
             server_ip=self._cfg.host,
             cmd_port=self._cfg.cmd_port,
             state_port=self._cfg.state_port,
         )
         self._client.connect()
+        self._bind_commands(self._client)
 
         logger.info("GripperBackend: connected to %s", self._cfg.host)
 
-    async def disconnect(self) -> None:
+    def disconnect(self) -> None:
         if self._client is not None:
             self._client.disconnect()
             self._client = None
+            self._bind_commands(None)
         logger.info("GripperBackend: disconnected")
 
-    @property
-    def is_connected(self) -> bool:
-        """Return True if connected to gripper server."""
-        return self._dry_run or self._client is not None
+    def _bind_commands(self, client: Any) -> None:
+        """Point each ``_cmd_<name>`` at the client's method.
+
+        Resolved once per (dis)connect so command calls skip the dry-run
+        branch and the ``self._client.<name>`` lookup. Also refreshes the
+        ``is_connected`` flag.
+        """
+        self.is_connected = self._dry_run or client is not None
+        for name, dry_run_fn in _DRY_RUN_COMMANDS.items():
+            if self._dry_run:
+                fn = dry_run_fn
+            elif client is None:
+                fn = _not_connected
+            else:
+                fn = getattr(client, name)
+            setattr(self, f"_cmd_{name}", fn)
 
     # -- state ---------------------------------------------------------------
 
     def get_state(self) -> dict:
         """Return gripper state as a plain dict."""
         if self._dry_run:
-            return {
-                "position": 0,
-                "position_mm": 85.0,
-                "is_activated": True,
-                "is_moving": False,
-                "object_detected": False,
-                "is_calibrated": True,
-                "current": 0,
-                "current_ma": 0.0,
-                "fault_code": 0,
-                "fault_message": "",
-            }
+            return _DRY_RUN_STATE.copy()
 
         if self._client is None:
             return {}
@@ -84,26 +161,13 @@ class GripperBackend:
         if state is None:
             return {}
 
-        return {
-            "position": state.position,
-            "position_mm": state.position_mm,
-            "is_activated": state.is_activated,
-            "is_moving": state.is_moving,
-            "object_detected": state.object_detected,
-            "is_calibrated": state.is_calibrated,
-            "current": state.current,
-            "current_ma": state.current_ma,
-            "fault_code": state.fault_code,
-            "fault_message": state.fault_message,
-        }
+        return dict(zip(_STATE_KEYS, _get_state_fields(state)))
 
     # -- commands ------------------------------------------------------------
 
     def activate(self, reset_first: bool = True) -> bool:
         """Activate/initialize the gripper."""
-        if self._dry_run:
-            return True
-        return self._client.activate(reset_first=reset_first)
+        return self._cmd_activate(reset_first=reset_first)
 
     def move(self, position: int, speed: int = 255, force: int = 255) -> tuple[int, bool]:
         """Move gripper to position (0-255).
@@ -111,9 +175,7 @@ class GripperBackend:
         Returns:
             Tuple of (final_position, object_detected)
         """
-        if self._dry_run:
-            return (position, False)
-        return self._client.move(position, speed, force)
+        return self._cmd_move(position, speed, force)
 
     def open(self, speed: int = 255, force: int = 255) -> tuple[int, bool]:
         """Open the gripper fully.
@@ -121,9 +183,7 @@ class GripperBackend:
         Returns:
             Tuple of (final_position, object_detected)
         """
-        if self._dry_run:
-            return (0, False)
-        return self._client.open(speed, force)
+        return self._cmd_open(speed, force)
 
     def close(self, speed: int = 255, force: int = 255) -> tuple[int, bool]:
         """Close the gripper fully.
@@ -131,21 +191,15 @@ class GripperBackend:
         Returns:
             Tuple of (final_position, object_detected)
         """
-        if self._dry_run:
-            return (255, False)
-        return self._client.close(speed, force)
+        return self._cmd_close(speed, force)
 
     def stop(self) -> bool:
         """Stop gripper motion."""
-        if self._dry_run:
-            return True
-        return self._client.stop()
+        return self._cmd_stop()
 
     def calibrate(self, open_mm: float = 85.0, close_mm: float = 0.0) -> bool:
         """Calibrate the gripper for mm positioning."""
-        if self._dry_run:
-            return True
-        return self._client.calibrate(open_mm, close_mm)
+        return self._cmd_calibrate(open_mm, close_mm)
 
     def grasp(self, speed: int = 255, force: int = 255) -> bool:
         """Close gripper to grasp an object.
@@ -153,6 +207,4 @@ class GripperBackend:
         Returns:
             True if object was detected/grasped
         """
-        if self._dry_run:
-            return True
-        return self._client.grasp(speed, force)
+        return self._cmd_grasp(speed, force)
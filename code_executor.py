@@ -4,20 +4,38 @@ from __future__ import annotations
 
 import ast
 import asyncio
+import hashlib
+import json
 import logging
 import os
+import re
+import shutil
 import signal
-import subprocess
 import tempfile
-import threading
 import time
-from dataclasses import dataclass, field
+from collections import OrderedDict, deque
+from itertools import islice
+from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Absolute interpreter path: Popen only takes its posix_spawn fast path
+# when the executable names a directory
+_PYTHON3 = shutil.which("python3") or "python3"
+
+# Agent server root (cwd of executed code) and the sibling packages the
+# wrapper imports, prepended to the subprocess PYTHONPATH
+_AGENT_SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+_CODE_PYTHONPATH = ":".join((
+    _AGENT_SERVER_DIR,
+    # franka_server (needed for FrankaClient import)
+    os.path.abspath(os.path.join(_AGENT_SERVER_DIR, "..", "franka_interact", "franka_server")),
+    os.path.abspath(os.path.join(_AGENT_SERVER_DIR, "..", "gripper_server")),
+))
+
 
 class ExecutionStatus(str, Enum):
     """Status of code execution."""
@@ -45,11 +63,15 @@ class ExecutionResult:
     started_at: float = 0.0
 
 
-@dataclass
+@dataclass(frozen=True)
 class CodeValidationResult:
-    """Result of code validation."""
+    """Result of code validation.
+
+    Immutable because CodeValidator hands the same cached instance to every
+    caller that submits identical code.
+    """
     valid: bool
-    errors: List[str] = field(default_factory=list)
+    errors: Tuple[str, ...] = ()
 
     def format_errors(self) -> str:
         """Format errors as a readable string for client feedback."""
@@ -61,6 +83,124 @@ class CodeValidationResult:
         return header + items + footer
 
 
+# Imports that agents almost certainly don't need
+_BLOCKED_IMPORTS = frozenset({
+    "subprocess",       # Shell commands
+    "shutil",           # rmtree, etc.
+    "pickle",           # Code execution via deserialization
+    "marshal",          # Same
+    "socket",           # Raw network access
+    "urllib",           # Network requests
+    "requests",         # Network requests
+    "httpx",            # Network requests
+    "aiohttp",          # Async network requests
+    "http",             # HTTP client/server
+    "ftplib",           # FTP
+    "smtplib",          # Email
+    "telnetlib",        # Telnet
+    "ctypes",           # C interop, memory access
+    "multiprocessing",  # Process spawning
+    "pty",              # Pseudo-terminal (shell access)
+    "pdb",              # Debugger (can execute arbitrary code)
+})
+
+# Dangerous function calls: (module, function) or (None, function) for builtins
+_BLOCKED_CALLS = frozenset({
+    # os module dangers - shell/process execution
+    ("os", "system"),
+    ("os", "popen"),
+    ("os", "popen2"),
+    ("os", "popen3"),
+    ("os", "popen4"),
+    ("os", "spawn"),
+    ("os", "spawnl"),
+    ("os", "spawnle"),
+    ("os", "spawnlp"),
+    ("os", "spawnlpe"),
+    ("os", "spawnv"),
+    ("os", "spawnve"),
+    ("os", "spawnvp"),
+    ("os", "spawnvpe"),
+    ("os", "execl"),
+    ("os", "execle"),
+    ("os", "execlp"),
+    ("os", "execlpe"),
+    ("os", "execv"),
+    ("os", "execve"),
+    ("os", "execvp"),
+    ("os", "execvpe"),
+    ("os", "fork"),
+    ("os", "forkpty"),
+    ("os", "kill"),
+    ("os", "killpg"),
+    # os module dangers - file deletion
+    ("os", "remove"),
+    ("os", "unlink"),
+    ("os", "rmdir"),
+    ("os", "removedirs"),
+    # Builtins - dynamic code execution
+    (None, "eval"),
+    (None, "exec"),
+    (None, "compile"),
+    (None, "__import__"),
+    # Builtins - file operations (open with write is checked separately)
+    (None, "input"),  # Can hang waiting for input
+})
+
+# Human-readable descriptions for blocked items
+_BLOCK_REASONS = {
+    "subprocess": "shell command execution",
+    "shutil": "file/directory operations (including deletion)",
+    "pickle": "code execution via deserialization",
+    "marshal": "code execution via deserialization",
+    "socket": "raw network access",
+    "urllib": "network requests",
+    "requests": "network requests",
+    "httpx": "network requests",
+    "aiohttp": "async network requests",
+    "http": "HTTP client/server",
+    "ftplib": "FTP access",
+    "smtplib": "email sending",
+    "telnetlib": "telnet access",
+    "ctypes": "C interop and memory access",
+    "multiprocessing": "process spawning",
+    "pty": "pseudo-terminal (shell access)",
+    "pdb": "debugger (can execute arbitrary code)",
+    "os.system": "shell command execution",
+    "os.popen": "shell command execution",
+    "os.fork": "process spawning",
+    "os.kill": "process termination",
+    "os.remove": "file deletion",
+    "os.unlink": "file deletion",
+    "os.rmdir": "directory deletion",
+    "eval": "dynamic code execution",
+    "exec": "dynamic code execution",
+    "compile": "dynamic code compilation",
+    "__import__": "dynamic module importing",
+    "input": "blocking user input (will hang)",
+}
+
+# Builtins from _BLOCKED_CALLS, checked by name without building a tuple
+_BLOCKED_BUILTINS = frozenset(func for module, func in _BLOCKED_CALLS if module is None)
+
+# Blocked attribute calls grouped by module name, so ``module.func()`` is one
+# dict lookup plus one set lookup instead of hashing a fresh (module, func)
+_BLOCKED_BY_MODULE = {
+    module: frozenset(func for mod, func in _BLOCKED_CALLS if mod == module)
+    for module in {mod for mod, _ in _BLOCKED_CALLS if mod is not None}
+}
+
+# Every import root and function name the scan can flag, as a whole word.
+# ASCII source without a match cannot produce a scan error, so _validate
+# only needs to parse it. (Non-ASCII source is always scanned: the parser
+# NFKC-normalizes identifiers, so "ｅｖａｌ" is eval.)
+_DANGER_WORDS_RE = re.compile(
+    r"\b(?:%s)\b" % "|".join(
+        sorted(_BLOCKED_IMPORTS | {func for _, func in _BLOCKED_CALLS})
+    )
+)
+
+
 class CodeValidator:
     """Basic static analysis to catch unintentional dangerous code.
 
@@ -75,190 +215,201 @@ class CodeValidator:
     - Process control (fork, kill, multiprocessing)
     """
 
-    # Imports that agents almost certainly don't need
-    BLOCKED_IMPORTS = {
-        "subprocess",       # Shell commands
-        "shutil",           # rmtree, etc.
-        "pickle",           # Code execution via deserialization
-        "marshal",          # Same
-        "socket",           # Raw network access
-        "urllib",           # Network requests
-        "requests",         # Network requests
-        "httpx",            # Network requests
-        "aiohttp",          # Async network requests
-        "http",             # HTTP client/server
-        "ftplib",           # FTP
-        "smtplib",          # Email
-        "telnetlib",        # Telnet
-        "ctypes",           # C interop, memory access
-        "multiprocessing",  # Process spawning
-        "pty",              # Pseudo-terminal (shell access)
-        "pdb",              # Debugger (can execute arbitrary code)
-    }
+    # Public aliases of the module-level constants _DangerVisitor reads
+    BLOCKED_IMPORTS = _BLOCKED_IMPORTS
+    BLOCKED_CALLS = _BLOCKED_CALLS
+    BLOCK_REASONS = _BLOCK_REASONS
 
-    # Dangerous function calls: (module, function) or (None, function) for builtins
-    BLOCKED_CALLS = {
-        # os module dangers - shell/process execution
-        ("os", "system"),
-        ("os", "popen"),
-        ("os", "popen2"),
-        ("os", "popen3"),
-        ("os", "popen4"),
-        ("os", "spawn"),
-        ("os", "spawnl"),
-        ("os", "spawnle"),
-        ("os", "spawnlp"),
-        ("os", "spawnlpe"),
-        ("os", "spawnv"),
-        ("os", "spawnve"),
-        ("os", "spawnvp"),
-        ("os", "spawnvpe"),
-        ("os", "execl"),
-        ("os", "execle"),
-        ("os", "execlp"),
-        ("os", "execlpe"),
-        ("os", "execv"),
-        ("os", "execve"),
-        ("os", "execvp"),
-        ("os", "execvpe"),
-        ("os", "fork"),
-        ("os", "forkpty"),
-        ("os", "kill"),
-        ("os", "killpg"),
-        # os module dangers - file deletion
-        ("os", "remove"),
-        ("os", "unlink"),
-        ("os", "rmdir"),
-        ("os", "removedirs"),
-        # Builtins - dynamic code execution
-        (None, "eval"),
-        (None, "exec"),
-        (None, "compile"),
-        (None, "__import__"),
-        # Builtins - file operations (open with write is checked separately)
-        (None, "input"),  # Can hang waiting for input
-    }
+    # Validation results kept per source hash (agents often resubmit code)
+    CACHE_SIZE = 256
 
-    # Human-readable descriptions for blocked items
-    BLOCK_REASONS = {
-        "subprocess": "shell command execution",
-        "shutil": "file/directory operations (including deletion)",
-        "pickle": "code execution via deserialization",
-        "marshal": "code execution via deserialization",
-        "socket": "raw network access",
-        "urllib": "network requests",
-        "requests": "network requests",
-        "httpx": "network requests",
-        "aiohttp": "async network requests",
-        "http": "HTTP client/server",
-        "ftplib": "FTP access",
-        "smtplib": "email sending",
-        "telnetlib": "telnet access",
-        "ctypes": "C interop and memory access",
-        "multiprocessing": "process spawning",
-        "pty": "pseudo-terminal (shell access)",
-        "pdb": "debugger (can execute arbitrary code)",
-        "os.system": "shell command execution",
-        "os.popen": "shell command execution",
-        "os.fork": "process spawning",
-        "os.kill": "process termination",
-        "os.remove": "file deletion",
-        "os.unlink": "file deletion",
-        "os.rmdir": "directory deletion",
-        "eval": "dynamic code execution",
-        "exec": "dynamic code execution",
-        "compile": "dynamic code compilation",
-        "__import__": "dynamic module importing",
-        "input": "blocking user input (will hang)",
-    }
+    def __init__(self) -> None:
+        self._cache: OrderedDict[bytes, CodeValidationResult] = OrderedDict()
 
     def validate(self, code: str) -> CodeValidationResult:
         """Validate code for obvious dangerous patterns.
 
+        Results are cached by a BLAKE2 digest of the source, so resubmitting
+        identical code skips parsing and the AST scan.
+
         Args:
             code: Python source code
 
         Returns:
             CodeValidationResult with valid=True/False and error messages
         """
-        errors = []
+        key, result = self._lookup(code)
+        if result is None:
+            result = self._validate(code)
+            self._store(key, result)
+        return result
 
+    def _lookup(self, code: str) -> Tuple[bytes, Optional[CodeValidationResult]]:
+        """Return the cache key for ``code`` and its cached result, if any."""
+        key = hashlib.blake2b(code.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+        return key, result
+
+    def _store(self, key: bytes, result: CodeValidationResult) -> None:
+        cache = self._cache
+        cache[key] = result
+        if len(cache) > self.CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _validate(self, code: str) -> CodeValidationResult:
+        """Parse and scan ``code``; the uncached body of ``validate``."""
         # Parse the code (also catches syntax errors)
         try:
             tree = ast.parse(code)
         except SyntaxError as e:
             return CodeValidationResult(
                 valid=False,
-                errors=[f"Syntax error at line {e.lineno}: {e.msg}"]
+                errors=(f"Syntax error at line {e.lineno}: {e.msg}",)
             )
 
-        # Walk the AST looking for dangerous patterns
-        for node in ast.walk(tree):
-            # Check imports: import x, import x.y
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    module = alias.name.split(".")[0]
-                    if module in self.BLOCKED_IMPORTS:
-                        reason = self.BLOCK_REASONS.get(module, "security risk")
-                        errors.append(
-                            f"Line {node.lineno}: 'import {alias.name}' is not allowed ({reason})"
-                        )
-
-            # Check imports: from x import y
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    module = node.module.split(".")[0]
-                    if module in self.BLOCKED_IMPORTS:
-                        reason = self.BLOCK_REASONS.get(module, "security risk")
-                        errors.append(
-                            f"Line {node.lineno}: 'from {node.module} import ...' is not allowed ({reason})"
-                        )
-
-            # Check function calls
-            elif isinstance(node, ast.Call):
-                call_info = self._get_call_info(node)
-                if call_info:
-                    module, func = call_info
-
-                    # Check module.function() calls (e.g., os.system)
-                    if module is not None and (module, func) in self.BLOCKED_CALLS:
-                        key = f"{module}.{func}"
-                        reason = self.BLOCK_REASONS.get(key, "security risk")
-                        errors.append(
-                            f"Line {node.lineno}: '{module}.{func}()' is not allowed ({reason})"
-                        )
-                    # Check builtin function calls (e.g., eval, exec)
-                    elif module is None and (None, func) in self.BLOCKED_CALLS:
-                        reason = self.BLOCK_REASONS.get(func, "security risk")
-                        errors.append(
-                            f"Line {node.lineno}: '{func}()' is not allowed ({reason})"
-                        )
+        if code.isascii() and _DANGER_WORDS_RE.search(code) is None:
+            return CodeValidationResult(valid=True)
+
+        visitor = _DangerVisitor()
+        visitor.visit(tree)
+        errors = visitor.errors
 
         return CodeValidationResult(
             valid=len(errors) == 0,
-            errors=errors
+            errors=tuple(errors)
         )
 
-    def _get_call_info(self, node: ast.Call) -> Optional[Tuple[Optional[str], str]]:
-        """Extract (module, function) from a Call node.
 
-        Returns:
-            Tuple of (module_name, function_name) or (None, function_name) for builtins,
-            or None if cannot determine.
-        """
-        if isinstance(node.func, ast.Attribute):
-            # e.g., os.system() -> ("os", "system")
-            if isinstance(node.func.value, ast.Name):
-                return (node.func.value.id, node.func.attr)
-        elif isinstance(node.func, ast.Name):
-            # e.g., eval() -> (None, "eval")
-            return (None, node.func.id)
-        return None
+# Node types whose subtrees can never contain an import or a call; the scan
+# does not descend into them (they make up most of a typical tree)
+_LEAF_NODES = frozenset({
+    ast.Name, ast.Constant, ast.alias,
+    ast.Load, ast.Store, ast.Del,
+    *ast.operator.__subclasses__(), *ast.unaryop.__subclasses__(),
+    *ast.cmpop.__subclasses__(), *ast.boolop.__subclasses__(),
+})
+
+
+class _DangerVisitor(ast.NodeVisitor):
+    """Single-pass scan collecting CodeValidator errors for one tree.
+
+    Dispatches on the exact node type instead of NodeVisitor's per-node
+    ``"visit_" + class name`` lookup, and skips leaf subtrees. Errors come
+    out in source order.
+    """
+
+    def __init__(self) -> None:
+        self.errors: List[str] = []
+        self._handlers = {
+            ast.Import: self.visit_Import,
+            ast.ImportFrom: self.visit_ImportFrom,
+            ast.Call: self.visit_Call,
+        }
+
+    def visit(self, node: ast.AST) -> None:
+        handler = self._handlers.get(type(node))
+        if handler is not None:
+            handler(node)
+        else:
+            self.generic_visit(node)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        visit = self.visit
+        for child in ast.iter_child_nodes(node):
+            if type(child) not in _LEAF_NODES:
+                visit(child)
+
+    # Check imports: import x, import x.y
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            module = alias.name.split(".")[0]
+            if module in _BLOCKED_IMPORTS:
+                reason = _BLOCK_REASONS.get(module, "security risk")
+                self.errors.append(
+                    f"Line {node.lineno}: 'import {alias.name}' is not allowed ({reason})"
+                )
+
+    # Check imports: from x import y
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module:
+            module = node.module.split(".")[0]
+            if module in _BLOCKED_IMPORTS:
+                reason = _BLOCK_REASONS.get(module, "security risk")
+                self.errors.append(
+                    f"Line {node.lineno}: 'from {node.module} import ...' is not allowed ({reason})"
+                )
+
+    # Check function calls
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        # Check module.function() calls (e.g., os.system)
+        if type(func) is ast.Attribute:
+            if type(func.value) is ast.Name:
+                module = func.value.id
+                banned = _BLOCKED_BY_MODULE.get(module)
+                if banned is not None and func.attr in banned:
+                    key = f"{module}.{func.attr}"
+                    reason = _BLOCK_REASONS.get(key, "security risk")
+                    self.errors.append(
+                        f"Line {node.lineno}: '{module}.{func.attr}()' is not allowed ({reason})"
+                    )
+        # Check builtin function calls (e.g., eval, exec)
+        elif type(func) is ast.Name:
+            if func.id in _BLOCKED_BUILTINS:
+                reason = _BLOCK_REASONS.get(func.id, "security risk")
+                self.errors.append(
+                    f"Line {node.lineno}: '{func.id}()' is not allowed ({reason})"
+                )
+        # Arguments may hold further calls, e.g. print(eval(x))
+        self.generic_visit(node)
 
 
 # Module-level validator instance
 _validator = CodeValidator()
 
+# Sources at least this long are validated in validation_worker.py, off the
+# event loop thread (parse + scan hold the GIL, so a thread wouldn't help)
+_WORKER_VALIDATE_MIN_SIZE = 10_000
+
+
+# Script wrapped around submitted code: initializes robot_sdk with backend
+# connections (code_prelude.py, whose bytecode Python caches), runs the
+# code, then disconnects. Encoded once at import;
+# _create_temp_file writes user code between the two halves.
+_WRAPPER_PROLOGUE = f'''#!/usr/bin/env python3
+"""Auto-generated code execution wrapper."""
+
+# Import from the agent server directory, not the script's own: under a
+# memfd that resolves to "/", and a mkstemp file lives in /tmp
+import sys
+sys.path[0] = {_AGENT_SERVER_DIR!r}
+
+# Connect backends and initialize robot_sdk (see code_prelude.py)
+from code_prelude import *
+
+# Also expose backends directly for advanced usage
+# (same pattern as rewind orchestrator uses)
+
+# ============================================================================
+# USER CODE STARTS HERE
+# ============================================================================
+
+'''.encode("utf-8")
+
+_WRAPPER_EPILOGUE = '''
+
+# ============================================================================
+# USER CODE ENDS HERE
+# ============================================================================
+
+# Cleanup (disconnect backends)
+franka_backend.disconnect()
+base_backend.disconnect()
+gripper_backend.disconnect()
+'''.encode("utf-8")
+
 
 class CodeExecutor:
     """Manages subprocess execution of submitted code.
@@ -267,22 +418,56 @@ class CodeExecutor:
     Enforces timeout from lease system.
     """
 
+    HISTORY_SIZE = 10
+    READ_CHUNK_SIZE = 65536  # bytes per pipe read
+
+    # Run code in a pre-started worker interpreter (code_worker.py) that has
+    # already paid for Python startup and SDK imports; each worker still runs
+    # only one execution. Off by default.
+    PREWARM = os.getenv("CODE_EXECUTOR_PREWARM", "false").lower() == "true"
+
+    # Human-readable error messages for stop() reasons
+    STOP_MESSAGES = {
+        "manual": "Stopped by user",
+        "arm_error": "Stopped: arm server crashed (auto-recovering)",
+        "idle_timeout": "Stopped: lease expired (idle timeout — no commands sent)",
+        "max_duration": "Stopped: lease expired (max duration reached)",
+        "queue_cleared": "Stopped: lease revoked (queue cleared)",
+    }
+
     def __init__(self) -> None:
-        self._process: Optional[subprocess.Popen] = None
+        self._process: Optional[asyncio.subprocess.Process] = None
         self._execution_id: Optional[str] = None
         self._start_time: Optional[float] = None
+        # Per-execution context, set by execute()
+        self._lease_id: Optional[str] = None
+        self._server_url: Optional[str] = None
+        self._holder = ""
+        self._client_host = ""
         self._last_result: Optional[ExecutionResult] = None
-        self._history: List[ExecutionResult] = []  # Last N results
-        self._temp_files: list[Path] = []
-        # Incremental output capture (thread-safe)
-        self._stdout_lines: List[str] = []
-        self._stderr_lines: List[str] = []
-        self._output_lock = threading.Lock()
+        self._history: deque[ExecutionResult] = deque(maxlen=self.HISTORY_SIZE)  # Last N results
+        # One wrapper file per executor, rewritten in place for each run
+        self._temp_path: Optional[Path] = None
+        self._memfd = -1  # fd backing _temp_path when it is a memfd
+        # Raw output captured by reader tasks on the event loop; decoded
+        # only when read (get_current_output)
+        self._stdout_buf = bytearray()
+        self._stderr_buf = bytearray()
+        # Set by stop() so execute() reports STOPPED; cleared per execution
+        self._stop_reason: Optional[str] = None
+        self._finished = asyncio.Event()
+        self._finished.set()  # No execution in progress
+        self._base_env = self._build_base_env()
+        self._spare: Optional[asyncio.subprocess.Process] = None  # PREWARM worker
+        # validation_worker.py, started on first large validation; the lock
+        # keeps one request in flight so replies stay in order
+        self._validation_worker: Optional[asyncio.subprocess.Process] = None
+        self._validation_lock = asyncio.Lock()
 
     @property
     def is_running(self) -> bool:
         """Check if code is currently executing."""
-        return self._process is not None and self._process.poll() is None
+        return self._process is not None and self._process.returncode is None
 
     def validate_code(self, code: str) -> CodeValidationResult:
         """Validate code before execution.
@@ -298,36 +483,89 @@ class CodeExecutor:
         """
         return _validator.validate(code)
 
+    async def validate_code_async(self, code: str) -> CodeValidationResult:
+        """Validate code like validate_code, without stalling the event loop.
+
+        Sources of _WORKER_VALIDATE_MIN_SIZE characters or more are parsed
+        and scanned in a worker process.
+        """
+        if len(code) < _WORKER_VALIDATE_MIN_SIZE:
+            return _validator.validate(code)
+        # Share the validator's cache so repeats skip the worker round trip
+        key, result = _validator._lookup(code)
+        if result is None:
+            result = await self._validate_in_worker(code)
+            _validator._store(key, result)
+        return result
+
+    async def _validate_in_worker(self, code: str) -> CodeValidationResult:
+        """Validate ``code`` in validation_worker.py, starting it if needed.
+
+        A request that fails or is cancelled midway kills the worker, so a
+        later request never reads a stale reply; on failure the code is
+        validated in-process instead.
+        """
+        async with self._validation_lock:
+            try:
+                worker = self._validation_worker
+                if worker is None or worker.returncode is not None:
+                    worker = self._validation_worker = await asyncio.create_subprocess_exec(
+                        _PYTHON3, os.path.join(_AGENT_SERVER_DIR, "validation_worker.py"),
+                        stdin=asyncio.subprocess.PIPE,
+                        stdout=asyncio.subprocess.PIPE,
+                        env=self._base_env,
+                        **self._spawn_options(_AGENT_SERVER_DIR),
+                    )
+                worker.stdin.write(json.dumps(code).encode("utf-8") + b"\n")
+                await worker.stdin.drain()
+                reply = json.loads(await worker.stdout.readline())
+            except Exception as e:
+                self.close_validation_worker()
+                logger.warning(f"Validation worker failed, validating in-process: {e!r}")
+                return _validator.validate(code)
+            except BaseException:
+                self.close_validation_worker()
+                raise
+        return CodeValidationResult(valid=reply["valid"], errors=tuple(reply["errors"]))
+
+    def close_spare_worker(self) -> None:
+        """Kill the pre-started PREWARM worker, if one is waiting."""
+        spare, self._spare = self._spare, None
+        if spare is not None and spare.returncode is None:
+            spare.kill()
+
+    def close_validation_worker(self) -> None:
+        """Kill the validation worker, if one was started."""
+        worker, self._validation_worker = self._validation_worker, None
+        if worker is not None and worker.returncode is None:
+            worker.kill()
+
     @property
     def status(self) -> ExecutionStatus:
         """Get current execution status."""
         if self._process is None:
             return ExecutionStatus.IDLE
-        if self._process.poll() is None:
+        if self._process.returncode is None:
             return ExecutionStatus.RUNNING
         if self._last_result:
             return self._last_result.status
         return ExecutionStatus.IDLE
 
-    def _read_stream(self, stream, target: str) -> None:
-        """Read from a stream line-by-line and accumulate into target list.
+    async def _read_stream(self, stream: asyncio.StreamReader, target: bytearray) -> None:
+        """Read a subprocess pipe until EOF, appending raw bytes to target.
 
-        Runs in a background thread. Reads until EOF.
+        Both pipes are drained concurrently, so a child flooding one of
+        them can't fill the other's pipe buffer and stall.
 
         Args:
-            stream: File-like object (process.stdout or process.stderr)
-            target: "stdout" or "stderr" to select accumulator
+            stream: process.stdout or process.stderr
+            target: Accumulator (self._stdout_buf or self._stderr_buf)
         """
-        try:
-            for line in stream:
-                with self._output_lock:
-                    if target == "stdout":
-                        self._stdout_lines.append(line)
-                    else:
-                        self._stderr_lines.append(line)
-        except (ValueError, OSError):
-            # Stream closed
-            pass
+        while True:
+            chunk = await stream.read(self.READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            target += chunk
 
     def get_current_output(self) -> Tuple[str, str]:
         """Get accumulated output so far (works during and after execution).
@@ -335,8 +573,10 @@ class CodeExecutor:
         Returns:
             Tuple of (stdout, stderr) strings
         """
-        with self._output_lock:
-            return "".join(self._stdout_lines), "".join(self._stderr_lines)
+        return (
+            self._stdout_buf.decode("utf-8", errors="replace"),
+            self._stderr_buf.decode("utf-8", errors="replace"),
+        )
 
     async def execute(
         self,
@@ -364,7 +604,9 @@ class CodeExecutor:
         Raises:
             RuntimeError: If code is already running
         """
-        if self.is_running:
+        # _finished also covers the window before the process exists, so a
+        # second submission can't overwrite the shared wrapper file
+        if self.is_running or not self._finished.is_set():
             raise RuntimeError("Code is already running. Stop it first.")
 
         self._execution_id = execution_id
@@ -373,52 +615,41 @@ class CodeExecutor:
         self._server_url = server_url
         self._holder = holder
         self._client_host = client_host
-
-        # Create temporary Python file with submitted code
-        temp_file = self._create_temp_file(code)
-        self._temp_files.append(temp_file)
-
-        logger.info(f"Executing code (ID: {execution_id}): {temp_file}")
+        self._stop_reason = None
+        self._finished.clear()
 
         # Reset output accumulators
-        with self._output_lock:
-            self._stdout_lines.clear()
-            self._stderr_lines.clear()
+        self._stdout_buf.clear()
+        self._stderr_buf.clear()
 
         try:
-            # Start subprocess
-            self._process = subprocess.Popen(
-                ["python3", "-u", str(temp_file)],  # -u for unbuffered output
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=os.path.dirname(__file__),  # Set working directory to agent server root
-                env=self._get_env(),
-            )
+            # Write the wrapper script with submitted code
+            temp_file = self._create_temp_file(code)
+            logger.info(f"Executing code (ID: {execution_id}): {temp_file}")
 
-            # Save local reference: stop() may set self._process = None
+            # Start subprocess; awaited on the event loop, no waiter threads
+            process = await self._start_process(temp_file)
+            # Keep the local reference: stop() may set self._process = None
             # while we're awaiting, so we need a stable reference.
-            process = self._process
+            self._process = process
 
-            # Start reader threads for incremental output capture
-            stdout_thread = threading.Thread(
-                target=self._read_stream, args=(process.stdout, "stdout"), daemon=True
+            # Reader tasks for incremental output capture
+            readers = asyncio.gather(
+                self._read_stream(process.stdout, self._stdout_buf),
+                self._read_stream(process.stderr, self._stderr_buf),
             )
-            stderr_thread = threading.Thread(
-                target=self._read_stream, args=(process.stderr, "stderr"), daemon=True
-            )
-            stdout_thread.start()
-            stderr_thread.start()
 
-            # Wait for completion or timeout (non-blocking to event loop)
+            # Wait for completion or timeout
             try:
-                exit_code = await asyncio.to_thread(process.wait, timeout=timeout)
-            except subprocess.TimeoutExpired:
-                process.kill()
-                await asyncio.to_thread(process.wait)
+                exit_code = await asyncio.wait_for(process.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                self._signal_group(process, signal.SIGKILL)
+                await process.wait()
                 # Wait for readers to finish consuming remaining output
-                stdout_thread.join(timeout=2.0)
-                stderr_thread.join(timeout=2.0)
+                try:
+                    await asyncio.wait_for(readers, timeout=2.0)
+                except asyncio.TimeoutError:
+                    pass  # A grandchild still holds the pipes open
                 stdout, stderr = self.get_current_output()
                 duration = time.time() - self._start_time
 
@@ -435,8 +666,10 @@ class CodeExecutor:
                 )
             else:
                 # Process exited normally - wait for readers to finish
-                stdout_thread.join(timeout=5.0)
-                stderr_thread.join(timeout=5.0)
+                try:
+                    await asyncio.wait_for(readers, timeout=5.0)
+                except asyncio.TimeoutError:
+                    pass
                 stdout, stderr = self.get_current_output()
                 duration = time.time() - self._start_time
 
@@ -474,19 +707,34 @@ class CodeExecutor:
 
         finally:
             self._process = None
-            # If stop() already recorded a STOPPED result for this execution,
-            # keep that result instead of overwriting with a misleading status.
-            if (self._last_result
-                    and self._last_result.execution_id == execution_id
-                    and self._last_result.status == ExecutionStatus.STOPPED):
-                result = self._last_result
-            else:
-                result.holder = self._holder
-                result.client_host = self._client_host
-                self._last_result = result
+            # If stop() killed the process, report that instead of the
+            # misleading signal exit code.
+            reason = self._stop_reason
+            if reason is not None:
+                result = ExecutionResult(
+                    status=ExecutionStatus.STOPPED,
+                    execution_id=execution_id,
+                    exit_code=result.exit_code,
+                    stdout=result.stdout,
+                    stderr=result.stderr,
+                    duration=result.duration,
+                    error=self.STOP_MESSAGES.get(reason, f"Stopped: {reason}"),
+                    stop_reason=reason,
+                    started_at=self._start_time or 0.0,
+                )
+            result.holder = self._holder
+            result.client_host = self._client_host
+            self._last_result = result
             self._history.append(result)
-            if len(self._history) > 10:
-                self._history = self._history[-10:]
+            if self.PREWARM and self._spare is None:
+                # Warm the next worker while the robot is idle. Done before
+                # _finished is set, so a stop() at shutdown returns only once
+                # the spare exists and close_spare_worker() can reap it.
+                try:
+                    self._spare = await self._spawn_worker()
+                except Exception as e:
+                    logger.warning(f"Failed to pre-start code worker: {e}")
+            self._finished.set()
 
         logger.info(
             f"Execution {execution_id} finished: {result.status} "
@@ -495,10 +743,65 @@ class CodeExecutor:
 
         return result
 
-    def stop(self, reason: str = "manual") -> bool:
+    async def _start_process(self, temp_file: Path) -> asyncio.subprocess.Process:
+        """Start the interpreter that runs ``temp_file``.
+
+        With PREWARM the script is handed to the spare worker (or a new one
+        if none is ready) instead of a fresh ``python3`` process.
+        """
+        env = self._get_env()
+        if not self.PREWARM:
+            return await asyncio.create_subprocess_exec(
+                _PYTHON3, "-u", str(temp_file),  # -u for unbuffered output
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                # Working directory: agent server root
+                **self._spawn_options(_AGENT_SERVER_DIR),
+            )
+
+        process, self._spare = self._spare, None
+        if process is None or process.returncode is not None:
+            process = await self._spawn_worker()
+        # The worker was started before this lease existed, so it receives
+        # the per-execution variables with the script path
+        request = {
+            "path": str(temp_file),
+            "env": {key: env[key] for key in ("ROBOT_LEASE_ID", "ROBOT_SERVER_URL") if key in env},
+        }
+        process.stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+        await process.stdin.drain()
+        process.stdin.close()
+        return process
+
+    async def _spawn_worker(self) -> asyncio.subprocess.Process:
+        """Start a code_worker.py interpreter that waits for a script path."""
+        return await asyncio.create_subprocess_exec(
+            _PYTHON3, "-u", os.path.join(_AGENT_SERVER_DIR, "code_worker.py"),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=self._base_env,
+            **self._spawn_options(_AGENT_SERVER_DIR),
+        )
+
+    @staticmethod
+    def _spawn_options(cwd: str) -> dict:
+        """Popen options that let CPython start the child with posix_spawn.
+
+        posix_spawn avoids fork's copy of the server's page tables, but
+        Popen only uses it with ``close_fds=False`` and no ``cwd``, so the
+        directory is passed only when the server runs from somewhere else.
+        Leaving fds open is safe: descriptors Python creates are
+        non-inheritable (PEP 446), so only the stdio pipes reach the child.
+        """
+        return {"close_fds": False, "cwd": None if os.getcwd() == cwd else cwd}
+
+    async def stop(self, reason: str = "manual") -> bool:
         """Stop currently running code.
 
-        Sends SIGTERM for graceful shutdown, then SIGKILL if needed.
+        Sends SIGTERM for graceful shutdown, then SIGKILL if needed, and
+        returns once execute() has recorded the STOPPED result.
 
         Args:
             reason: Why the execution was stopped. Common values:
@@ -515,69 +818,81 @@ class CodeExecutor:
             return False
 
         logger.info(f"Stopping execution {self._execution_id} (reason: {reason})")
+        process = self._process
+        # Tells execute() to record this as STOPPED rather than FAILED
+        self._stop_reason = reason
 
         # Try graceful shutdown first
-        self._process.terminate()
+        self._signal_group(process, signal.SIGTERM)
 
         try:
             # Wait up to 2 seconds for graceful shutdown
-            self._process.wait(timeout=2.0)
-        except subprocess.TimeoutExpired:
+            await asyncio.wait_for(process.wait(), timeout=2.0)
+        except asyncio.TimeoutError:
             # Force kill if still running
             logger.warning(f"Graceful shutdown failed, force killing {self._execution_id}")
-            self._process.kill()
-            self._process.wait()
-
-        duration = time.time() - self._start_time if self._start_time else 0
-
-        # Give reader threads a moment to flush, then grab accumulated output
-        time.sleep(0.1)
-        stdout, stderr = self.get_current_output()
-
-        # Human-readable error messages
-        reason_messages = {
-            "manual": "Stopped by user",
-            "arm_error": "Stopped: arm server crashed (auto-recovering)",
-            "idle_timeout": "Stopped: lease expired (idle timeout — no commands sent)",
-            "max_duration": "Stopped: lease expired (max duration reached)",
-            "queue_cleared": "Stopped: lease revoked (queue cleared)",
-        }
-        error_msg = reason_messages.get(reason, f"Stopped: {reason}")
-
-        self._last_result = ExecutionResult(
-            status=ExecutionStatus.STOPPED,
-            execution_id=self._execution_id or "unknown",
-            exit_code=self._process.returncode,
-            stdout=stdout,
-            stderr=stderr,
-            duration=duration,
-            error=error_msg,
-            stop_reason=reason,
-            started_at=self._start_time or 0.0,
-        )
+            self._signal_group(process, signal.SIGKILL)
+            await process.wait()
 
-        self._process = None
+        # Let execute() drain the remaining output and record the result
+        # (its readers give up after 5 s if a grandchild holds the pipes)
+        try:
+            await asyncio.wait_for(self._finished.wait(), timeout=6.0)
+        except asyncio.TimeoutError:
+            logger.warning(f"Execution {self._execution_id} did not finish after stop")
         return True
 
+    @staticmethod
+    def _signal_group(process: asyncio.subprocess.Process, sig: int) -> None:
+        """Send ``sig`` to the code's process group, falling back to the process.
+
+        code_prelude makes the child a process-group leader, so anything it
+        spawned is signalled too and can't keep the output pipes open. A
+        child that hasn't got that far has no group of its own yet, and is
+        signalled directly.
+        """
+        try:
+            os.killpg(process.pid, sig)
+            return
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            process.send_signal(sig)
+        except ProcessLookupError:
+            pass  # Already exited
+
     def get_last_result(self) -> Optional[ExecutionResult]:
         """Get result from last execution."""
         return self._last_result
 
     def get_history(self, count: int = 3) -> List[ExecutionResult]:
         """Get last N execution results (newest first)."""
-        return list(reversed(self._history[-count:]))
+        return list(islice(reversed(self._history), max(count, 0)))
 
     def cleanup_temp_files(self) -> None:
-        """Remove temporary code files."""
-        for temp_file in self._temp_files:
-            try:
+        """Remove the temporary code file (or close its memfd)."""
+        temp_file = self._temp_path
+        if temp_file is None:
+            return
+        try:
+            if self._memfd >= 0:
+                os.close(self._memfd)
+                self._memfd = -1
+            else:
                 temp_file.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to delete temp file {temp_file}: {e}")
-        self._temp_files.clear()
+        except Exception as e:
+            logger.warning(f"Failed to delete temp file {temp_file}: {e}")
+        self._temp_path = None
 
     def _create_temp_file(self, code: str) -> Path:
-        """Create temporary Python file with code + SDK initialization.
+        """Write temporary Python file with code + SDK initialization.
+
+        On Linux the script lives in an anonymous memfd held open by the
+        server and is run through its ``/proc/<pid>/fd`` link, so nothing
+        touches /tmp. Elsewhere the file is created once with mkstemp
+        (random name, mode 0600) and truncated and rewritten for later
+        runs; it is reopened without O_CREAT and with O_NOFOLLOW so a
+        swapped-in path is never written through.
 
         Args:
             code: User-submitted Python code
@@ -585,184 +900,81 @@ class CodeExecutor:
         Returns:
             Path to temporary file
         """
-        # Wrapper code that initializes robot_sdk before running user code
-        wrapper = f'''#!/usr/bin/env python3
-"""Auto-generated code execution wrapper."""
-
-import sys
-import os
-
-# Add parent directory to path so robot_sdk can be imported
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
-# Initialize robot_sdk with backend connections
-from backends.franka import FrankaBackend
-from backends.base import BaseBackend
-from backends.gripper import GripperBackend
-from config import FrankaBackendConfig, BaseBackendConfig, GripperBackendConfig
-from robot_sdk import ArmAPI, BaseAPI, GripperAPI, SensorAPI, YoloAPI
-import robot_sdk
-
-# Create backend configurations (use environment variables or defaults)
-import asyncio
-
-dry_run = os.getenv("ROBOT_DRY_RUN", "false").lower() == "true"
-
-franka_config = FrankaBackendConfig(
-    host=os.getenv("FRANKA_IP", "localhost"),
-    cmd_port=5555,
-    state_port=5556,
-    stream_port=5557,
-)
-
-base_config = BaseBackendConfig(
-    host=os.getenv("BASE_IP", "localhost"),
-    port=50000,
-    authkey=b"secret password",
-)
-
-gripper_config = GripperBackendConfig(
-    host=os.getenv("GRIPPER_IP", "localhost"),
-    cmd_port=5570,
-    state_port=5571,
-)
-
-# Create backends
-franka_backend = FrankaBackend(franka_config, dry_run=dry_run)
-base_backend = BaseBackend(base_config, dry_run=dry_run)
-gripper_backend = GripperBackend(gripper_config, dry_run=dry_run)
-
-# Connect to backends (gracefully handle unavailable ones)
-async def init_backends():
-    # Franka (arm) - required
-    try:
-        await franka_backend.connect()
-        print("[SDK] Franka backend connected")
-    except Exception as e:
-        print(f"[SDK] WARNING: Franka backend unavailable: {{e}}")
-
-    # Base - optional
-    try:
-        await base_backend.connect()
-        print("[SDK] Base backend connected")
-    except Exception as e:
-        print(f"[SDK] WARNING: Base backend unavailable: {{e}}")
-
-    # Gripper - optional
-    try:
-        await gripper_backend.connect()
-        print("[SDK] Gripper backend connected")
-    except Exception as e:
-        print(f"[SDK] WARNING: Gripper backend unavailable: {{e}}")
-
-asyncio.run(init_backends())
-
-# Initialize SDK global instances
-robot_sdk.arm = ArmAPI(franka_backend)
-robot_sdk.base = BaseAPI(base_backend)
-robot_sdk.gripper = GripperAPI(gripper_backend)
-robot_sdk.sensors = SensorAPI(franka_backend, base_backend, gripper_backend)
-
-# Initialize rewind API (uses HTTP calls to agent server)
-from robot_sdk.rewind import RewindAPI
-server_url = os.getenv("ROBOT_SERVER_URL", "http://localhost:8080")
-lease_id = os.getenv("ROBOT_LEASE_ID")
-robot_sdk.rewind = RewindAPI(server_url=server_url, lease_id=lease_id)
-print(f"[SDK] Rewind API initialized (server: {{server_url}})")
-
-# Initialize YOLO API (uses HTTP calls to remote YOLO server + agent server cameras)
-from robot_sdk.yolo import YoloAPI
-robot_sdk.yolo = YoloAPI(
-    yolo_server_url="http://158.130.109.188:8010",
-    agent_server_url=server_url,
-)
-print("[SDK] YOLO API initialized")
-
-# Initialize display API (uses HTTP calls to agent server)
-from robot_sdk.display import DisplayAPI
-robot_sdk.display = DisplayAPI(server_url=server_url)
-print("[SDK] Display API initialized")
-
-# Make them available for import
-arm = robot_sdk.arm
-base = robot_sdk.base
-gripper = robot_sdk.gripper
-sensors = robot_sdk.sensors
-rewind = robot_sdk.rewind
-yolo = robot_sdk.yolo
-display = robot_sdk.display
-
-# Also expose backends directly for advanced usage
-# (same pattern as rewind orchestrator uses)
-
-# ============================================================================
-# USER CODE STARTS HERE
-# ============================================================================
-
-{code}
-
-# ============================================================================
-# USER CODE ENDS HERE
-# ============================================================================
-
-# Cleanup (disconnect backends)
-async def cleanup():
-    await franka_backend.disconnect()
-    await base_backend.disconnect()
-    await gripper_backend.disconnect()
+        # Pre-encoded wrapper halves around the code: one writev, no
+        # formatted copy of the whole script
+        chunks = (_WRAPPER_PROLOGUE, code.encode("utf-8"), _WRAPPER_EPILOGUE)
+        if self._temp_path is None:
+            self._open_memfd()
+        if self._memfd >= 0:
+            os.ftruncate(self._memfd, 0)
+            os.pwritev(self._memfd, chunks, 0)
+            return self._temp_path
+
+        path = self._temp_path
+        fd = -1
+        if path is not None:
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_TRUNC | os.O_NOFOLLOW)
+            except FileNotFoundError:
+                pass  # Removed by a /tmp cleaner; create a new one
+        if fd < 0:
+            fd, name = tempfile.mkstemp(suffix=".py", prefix="robot_code_")
+            path = self._temp_path = Path(name)
+        try:
+            os.writev(fd, chunks)
+        finally:
+            os.close(fd)
 
-asyncio.run(cleanup())
-'''
+        return path
 
-        # Create temporary file
-        fd, path = tempfile.mkstemp(suffix=".py", prefix="robot_code_")
-        os.write(fd, wrapper.encode("utf-8"))
-        os.close(fd)
+    def _open_memfd(self) -> None:
+        """Create the memfd backing the script, if the platform has one.
 
-        return Path(path)
+        The child opens the parent's ``/proc/<pid>/fd`` entry rather than an
+        inherited descriptor, so no ``pass_fds`` is needed (that would rule
+        out posix_spawn) and prewarmed workers can open it too.
+        """
+        try:
+            fd = os.memfd_create("robot_code", os.MFD_CLOEXEC)
+        except (AttributeError, OSError):
+            return  # Not Linux; fall back to mkstemp
+        path = Path(f"/proc/{os.getpid()}/fd/{fd}")
+        if not path.exists():
+            os.close(fd)  # /proc not mounted
+            return
+        self._memfd = fd
+        self._temp_path = path
 
     def _get_env(self) -> dict:
         """Get environment variables for subprocess.
 
-        Returns current environment with Python path modifications and SDK config.
+        Returns the precomputed base environment plus per-execution SDK config.
         """
-        env = os.environ.copy()
+        env = self._base_env.copy()
 
-        # Add agent server directory to Python path (for backends, robot_sdk, etc.)
-        agent_server_dir = os.path.dirname(__file__)
-        agent_server_dir = os.path.abspath(agent_server_dir)
+        # Add lease ID and server URL for rewind API
+        if self._lease_id:
+            env["ROBOT_LEASE_ID"] = self._lease_id
+        if self._server_url:
+            env["ROBOT_SERVER_URL"] = self._server_url
 
-        # Add franka_server to Python path (needed for FrankaClient import)
-        franka_pkg = os.path.join(
-            agent_server_dir,
-            "..",
-            "franka_interact",
-            "franka_server",
-        )
-        franka_pkg = os.path.abspath(franka_pkg)
+        return env
 
-        # Add gripper_server to Python path
-        gripper_pkg = os.path.join(
-            agent_server_dir,
-            "..",
-            "gripper_server",
-        )
-        gripper_pkg = os.path.abspath(gripper_pkg)
+    @staticmethod
+    def _build_base_env() -> dict:
+        """Build the execution-independent part of the subprocess environment.
+
+        Returns current environment with Python path modifications. Computed
+        once in __init__; _get_env copies it per execution.
+        """
+        env = os.environ.copy()
 
-        # Add all paths to PYTHONPATH
+        # Agent server directory (for backends, robot_sdk, etc.) and the
+        # franka/gripper client packages, ahead of any existing PYTHONPATH
         python_path = env.get("PYTHONPATH", "")
-        paths = [agent_server_dir, franka_pkg, gripper_pkg]
-        if python_path:
-            paths.append(python_path)
-        env["PYTHONPATH"] = ":".join(paths)
+        env["PYTHONPATH"] = f"{_CODE_PYTHONPATH}:{python_path}" if python_path else _CODE_PYTHONPATH
 
         # Ensure Python output is unbuffered for real-time log capture
         env["PYTHONUNBUFFERED"] = "1"
 
-        # Add lease ID and server URL for rewind API
-        if hasattr(self, "_lease_id") and self._lease_id:
-            env["ROBOT_LEASE_ID"] = self._lease_id
-        if hasattr(self, "_server_url") and self._server_url:
-            env["ROBOT_SERVER_URL"] = self._server_url
-
         return env
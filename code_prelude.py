@@ -0,0 +1,123 @@
+"""SDK setup for code run by CodeExecutor.
+
+Imported by the generated wrapper script (``from code_prelude import *``)
+before the submitted code: connects the backends and initializes the
+robot_sdk globals. Living in a module means Python caches its bytecode in
+__pycache__, so each execution only compiles the submitted code itself.
+Everything bound here is re-exported into the script's namespace, as when
+this setup was inlined in the wrapper.
+"""
+
+import sys
+import os
+
+# Lead a process group, so CodeExecutor's stop/timeout signals also reach
+# anything this code spawns (setpgid keeps the server's posix_spawn path,
+# which start_new_session would rule out)
+os.setpgid(0, 0)
+
+# Grow the stdout/stderr pipes to the server from 64 KiB to 1 MiB (the
+# default unprivileged maximum) so bursts of prints don't block on the
+# server's readers. Linux only; skipped when not a pipe or over the limit.
+try:
+    import fcntl as _fcntl
+    for _fd in (1, 2):
+        _fcntl.fcntl(_fd, _fcntl.F_SETPIPE_SZ, 1 << 20)
+except (ImportError, AttributeError, OSError):
+    pass
+
+# Add parent directory to path so robot_sdk can be imported
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Initialize robot_sdk with backend connections
+from backends.franka import FrankaBackend
+from backends.base import BaseBackend
+from backends.gripper import GripperBackend
+from config import FrankaBackendConfig, BaseBackendConfig, GripperBackendConfig
+from robot_sdk import ArmAPI, BaseAPI, GripperAPI, SensorAPI, YoloAPI
+import robot_sdk
+
+# Create backend configurations (use environment variables or defaults)
+import asyncio
+
+dry_run = os.getenv("ROBOT_DRY_RUN", "false").lower() == "true"
+
+franka_config = FrankaBackendConfig(
+    host=os.getenv("FRANKA_IP", "localhost"),
+    cmd_port=5555,
+    state_port=5556,
+    stream_port=5557,
+)
+
+base_config = BaseBackendConfig(
+    host=os.getenv("BASE_IP", "localhost"),
+    port=50000,
+    authkey=b"secret password",
+)
+
+gripper_config = GripperBackendConfig(
+    host=os.getenv("GRIPPER_IP", "localhost"),
+    cmd_port=5570,
+    state_port=5571,
+)
+
+# Create backends
+franka_backend = FrankaBackend(franka_config, dry_run=dry_run)
+base_backend = BaseBackend(base_config, dry_run=dry_run)
+gripper_backend = GripperBackend(gripper_config, dry_run=dry_run)
+
+# Connect to backends (gracefully handle unavailable ones). The handshakes
+# are independent, so they run in parallel; results print in fixed order.
+# Franka (arm) - required; Base, Gripper - optional
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
+
+with _ThreadPoolExecutor(max_workers=3) as _pool:
+    _connects = [
+        (name, _pool.submit(backend.connect))
+        for name, backend in (
+            ("Franka", franka_backend),
+            ("Base", base_backend),
+            ("Gripper", gripper_backend),
+        )
+    ]
+for _name, _future in _connects:
+    try:
+        _future.result()
+        print(f"[SDK] {_name} backend connected")
+    except Exception as e:
+        print(f"[SDK] WARNING: {_name} backend unavailable: {e}")
+
+# Initialize SDK global instances
+robot_sdk.arm = ArmAPI(franka_backend)
+robot_sdk.base = BaseAPI(base_backend)
+robot_sdk.gripper = GripperAPI(gripper_backend)
+robot_sdk.sensors = SensorAPI(franka_backend, base_backend, gripper_backend)
+
+# Initialize rewind API (uses HTTP calls to agent server)
+from robot_sdk.rewind import RewindAPI
+server_url = os.getenv("ROBOT_SERVER_URL", "http://localhost:8080")
+lease_id = os.getenv("ROBOT_LEASE_ID")
+robot_sdk.rewind = RewindAPI(server_url=server_url, lease_id=lease_id)
+print(f"[SDK] Rewind API initialized (server: {server_url})")
+
+# Initialize YOLO API (uses HTTP calls to remote YOLO server + agent server cameras)
+from robot_sdk.yolo import YoloAPI
+robot_sdk.yolo = YoloAPI(
+    yolo_server_url="http://158.130.109.188:8010",
+    agent_server_url=server_url,
+)
+print("[SDK] YOLO API initialized")
+
+# Initialize display API (uses HTTP calls to agent server)
+from robot_sdk.display import DisplayAPI
+robot_sdk.display = DisplayAPI(server_url=server_url)
+print("[SDK] Display API initialized")
+
+# Make them available for import
+arm = robot_sdk.arm
+base = robot_sdk.base
+gripper = robot_sdk.gripper
+sensors = robot_sdk.sensors
+rewind = robot_sdk.rewind
+yolo = robot_sdk.yolo
+display = robot_sdk.display
@@ -0,0 +1,37 @@
+"""Pre-started interpreter for CodeExecutor (enabled by CODE_EXECUTOR_PREWARM).
+
+Imports the robot SDK and backend modules up front, then blocks on stdin for
+one JSON request ``{"path": ..., "env": {...}}`` naming a generated wrapper
+script. The script runs as ``__main__`` exactly as ``python3 -u <path>``
+would, and the worker exits afterwards, so every execution still gets a
+fresh, killable process -- only interpreter startup and imports are paid
+ahead of time.
+"""
+
+import json
+import os
+import runpy
+import sys
+
+# Warm the imports the wrapper script performs
+import numpy  # noqa: F401
+import robot_sdk  # noqa: F401
+from backends.base import BaseBackend  # noqa: F401
+from backends.franka import FrankaBackend  # noqa: F401
+from backends.gripper import GripperBackend  # noqa: F401
+from config import BaseBackendConfig, FrankaBackendConfig, GripperBackendConfig  # noqa: F401
+
+
+def main() -> None:
+    line = sys.stdin.readline()
+    if not line:
+        return  # Server went away without using this worker
+    request = json.loads(line)
+    os.environ.update(request.get("env", {}))
+    path = request["path"]
+    sys.argv = [path]
+    runpy.run_path(path, run_name="__main__")
+
+
+if __name__ == "__main__":
+    main()
@@ -170,6 +170,8 @@ class CameraBackendConfig:
     streams: list[str] = field(default_factory=lambda: ["color", "depth"])
     stream_fps: int = 15                # streaming FPS
     quality: int = 80                   # JPEG quality for color frames
+    encoder: str = "auto"               # JPEG encoder: auto, simplejpeg, opencv, nvjpeg
+    frame_max_age: float = 2.0          # seconds before a cached frame is stale
 
 
 # Backward compatibility alias
@@ -280,7 +280,7 @@ class LeaseManager:
                 executor = get_executor()
                 if executor.is_running:
                     logger.info("Stopping running code execution before reset (reason: %s)", reason)
-                    executor.stop(reason=reason)
+                    await executor.stop(reason=reason)
             except Exception as e:
                 logger.warning("Failed to stop code executor: %s", e)
 
@@ -113,7 +113,7 @@ def init_code_routes(lease_manager: LeaseManager):
             )
 
         # Validate code before execution (catches dangerous patterns)
-        validation = executor.validate_code(body.code)
+        validation = await executor.validate_code_async(body.code)
         if not validation.valid:
             logger.warning(f"Code validation failed for lease {x_lease_id}: {validation.errors}")
             return CodeExecuteResponse(
@@ -173,7 +173,7 @@ def init_code_routes(lease_manager: LeaseManager):
         No lease required. Use this to pre-check code before submitting to /execute.
         """
         executor = get_executor()
-        validation = executor.validate_code(body.code)
+        validation = await executor.validate_code_async(body.code)
 
         if validation.valid:
             return CodeValidateResponse(
@@ -211,7 +211,7 @@ def init_code_routes(lease_manager: LeaseManager):
             )
 
         logger.info(f"Stopping code execution for lease {x_lease_id}")
-        stopped = executor.stop(reason="manual")
+        stopped = await executor.stop(reason="manual")
 
         if stopped:
             return CodeStopResponse(
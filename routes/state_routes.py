@@ -1,4 +1,4 @@
-"""GET /state, /health, /state/cameras, /cameras endpoints."""
+"""GET /state, /health, /state/arm, /state/cameras, /cameras endpoints."""
 
 from __future__ import annotations
 
@@ -14,6 +14,11 @@ def create_router(state_agg, camera_backend, lease_mgr, base_backend, franka_bac
     async def get_state():
         return state_agg.state
 
+    @router.get("/state/arm")
+    async def get_arm_state():
+        """Live arm state, read straight from franka_server (not the poll cache)."""
+        return Response(content=franka_backend.get_state_json(), media_type="application/json")
+
     # Headers to prevent browser/proxy caching of camera frames
     _no_cache_headers = {"Cache-Control": "no-store, no-cache, must-revalidate", "Pragma": "no-cache"}
 
@@ -29,11 +34,24 @@ def create_router(state_agg, camera_backend, lease_mgr, base_backend, franka_bac
             return JSONResponse({"error": "no camera frame available"}, status_code=503)
         return Response(content=frame, media_type="image/jpeg", headers=_no_cache_headers)
 
+    @router.get("/state/cameras/all")
+    async def get_all_camera_frames():
+        """Get the latest JPEG from every camera as one multipart/mixed body.
+
+        Each part carries an ``X-Device-Id`` header.
+        """
+        body = b"".join(camera_backend.iter_multipart())
+        return Response(
+            content=body,
+            media_type=f"multipart/mixed; boundary={camera_backend.MULTIPART_BOUNDARY}",
+            headers=_no_cache_headers,
+        )
+
     @router.get("/cameras")
     async def list_cameras():
         """List connected cameras."""
         cameras = camera_backend.get_cameras()
-        state = camera_backend.get_state()
+        state = await camera_backend.get_state_async()
         return {
             "cameras": cameras,
             "connected": camera_backend.is_connected,
@@ -60,9 +78,10 @@ def create_router(state_agg, camera_backend, lease_mgr, base_backend, franka_bac
             if decoded is None:
                 return JSONResponse({"error": f"no {stream} frame available"}, status_code=503)
 
-            import cv2
-            _, png = cv2.imencode(".png", decoded.frame)
-            return Response(content=png.tobytes(), media_type="image/png", headers=_no_cache_headers)
+            png = camera_backend.encode_depth_png(decoded.frame)
+            if png is None:
+                return JSONResponse({"error": "PNG encoder not available"}, status_code=503)
+            return Response(content=png, media_type="image/png", headers=_no_cache_headers)
 
     @router.get("/cameras/{device_id}/intrinsics")
     async def get_device_intrinsics(device_id: str, stream: str = "color"):
@@ -11,12 +11,6 @@ from typing import Any, Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
-try:
-    import cv2
-    CV2_AVAILABLE = True
-except ImportError:
-    CV2_AVAILABLE = False
-
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
@@ -135,17 +129,16 @@ def create_router(state_agg, feedback_broadcaster: FeedbackBroadcaster, config,
                         if frame is None:
                             continue
                         
-                        # Encode frame
-                        if stream_type == "color" and CV2_AVAILABLE:
-                            encode_params = [cv2.IMWRITE_JPEG_QUALITY, subscription.quality]
-                            _, encoded = cv2.imencode(".jpg", frame.frame, encode_params)
-                            data = encoded.tobytes()
+                        # Encode frame (color encodes are shared between
+                        # subscribers asking for the same quality)
+                        data = None
+                        if stream_type == "color":
+                            data = camera_backend.encode_decoded_frame(frame, subscription.quality)
                             fmt = "jpeg"
-                        elif stream_type == "depth" and CV2_AVAILABLE:
-                            _, encoded = cv2.imencode(".png", frame.frame)
-                            data = encoded.tobytes()
+                        elif stream_type == "depth":
+                            data = camera_backend.encode_depth_png(frame.frame)
                             fmt = "png"
-                        else:
+                        if data is None:
                             data = frame.frame.tobytes()
                             fmt = "raw"
                         
@@ -204,7 +197,7 @@ def create_router(state_agg, feedback_broadcaster: FeedbackBroadcaster, config,
                         await ws.send_json({"type": "ack", "action": "unsubscribe"})
                     
                     elif action == "get_state":
-                        state = camera_backend.get_state()
+                        state = await camera_backend.get_state_async()
                         await ws.send_json({"type": "state", "data": state})
                     
                 except asyncio.TimeoutError:
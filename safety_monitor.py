@@ -159,10 +159,13 @@ class SafetyMonitor:
             self._collision_detected = False
             return False
 
-        # Get actual velocity from state
-        base_state = self._state_agg.state.get("base", {})
-        actual_vel = base_state.get("velocity", [0, 0, 0])
-        actual_speed = math.hypot(actual_vel[0], actual_vel[1])
+        # Get actual velocity from state (no temporary default containers)
+        base_state = self._state_agg.state.get("base")
+        actual_vel = base_state.get("velocity") if base_state is not None else None
+        if actual_vel is None:
+            actual_speed = 0.0
+        else:
+            actual_speed = math.hypot(actual_vel[0], actual_vel[1])
 
         ratio = actual_speed / cmd_speed
 
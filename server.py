@@ -167,19 +167,20 @@ def build_app(cfg: ServerConfig, service_mgr: ServiceManager | None = None) -> F
         if service_mgr is not None:
             await service_mgr.start()
 
-        # Connect to backends - failures are logged but don't crash the server
+        # Connect to backends - failures are logged but don't crash the server.
+        # connect() blocks on the network, so it runs off the event loop.
         try:
-            await base_backend.connect()
+            await asyncio.to_thread(base_backend.connect)
         except Exception as e:
             logger.error("Failed to connect to base backend: %s", e)
 
         try:
-            await franka_backend.connect()
+            await asyncio.to_thread(franka_backend.connect)
         except Exception as e:
             logger.error("Failed to connect to franka backend: %s", e)
 
         try:
-            await gripper_backend.connect()
+            await asyncio.to_thread(gripper_backend.connect)
         except Exception as e:
             logger.error("Failed to connect to gripper backend: %s", e)
 
@@ -245,8 +246,10 @@ def build_app(cfg: ServerConfig, service_mgr: ServiceManager | None = None) -> F
             executor = get_executor()
             if executor.is_running:
                 logger.info("Stopping running code execution")
-                executor.stop()
+                await executor.stop()
             executor.cleanup_temp_files()
+            executor.close_spare_worker()
+            executor.close_validation_worker()
         except Exception as e:
             logger.warning(f"Failed to cleanup code executor: {e}")
 
@@ -262,9 +265,9 @@ def build_app(cfg: ServerConfig, service_mgr: ServiceManager | None = None) -> F
         await lease_mgr.stop()
         await state_agg.stop()
         await camera_backend.stop()
-        await gripper_backend.disconnect()
-        await franka_backend.disconnect()
-        await base_backend.disconnect()
+        await asyncio.to_thread(gripper_backend.disconnect)
+        await asyncio.to_thread(franka_backend.disconnect)
+        await asyncio.to_thread(base_backend.disconnect)
 
         # Stop service manager last
         if service_mgr is not None:
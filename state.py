@@ -83,6 +83,8 @@ class StateAggregator:
         self._prev_base_pose: list[float] = []
         self._prev_gripper_pos: float = 0.0
         self._last_moved_at: float = 0.0
+        # Set while the latest poll produced a full 7-DOF arm state
+        self._arm_ready = asyncio.Event()
 
     @property
     def state(self) -> dict[str, Any]:
@@ -92,6 +94,21 @@ class StateAggregator:
         """Return timestamp of last detected robot movement."""
         return self._last_moved_at
 
+    def clear_arm_ready(self) -> None:
+        """Forget the current arm state so the next wait needs a fresh poll."""
+        self._arm_ready.clear()
+
+    async def wait_arm_ready(self, timeout: float) -> bool:
+        """Wait until a poll yields a valid 7-DOF arm state.
+
+        Returns False if none arrives within ``timeout`` seconds.
+        """
+        try:
+            await asyncio.wait_for(self._arm_ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
     def _update_movement_tracking(self, arm_q: list, base_pose: list, gripper_pos: float) -> None:
         """Compare current positions to previous and update last_moved_at."""
         moved = False
@@ -134,7 +151,7 @@ class StateAggregator:
             if now - self._last_base_reconnect > RECONNECT_INTERVAL:
                 self._last_base_reconnect = now
                 try:
-                    await self._base.connect()
+                    await asyncio.to_thread(self._base.connect)
                     if self._base.is_connected:
                         logger.info("Reconnected to base backend")
                 except Exception as e:
@@ -145,7 +162,7 @@ class StateAggregator:
             if now - self._last_franka_reconnect > RECONNECT_INTERVAL:
                 self._last_franka_reconnect = now
                 try:
-                    await self._franka.connect()
+                    await asyncio.to_thread(self._franka.connect)
                     if self._franka.is_connected:
                         logger.info("Reconnected to franka backend")
                 except Exception as e:
@@ -156,7 +173,7 @@ class StateAggregator:
             if now - self._last_gripper_reconnect > RECONNECT_INTERVAL:
                 self._last_gripper_reconnect = now
                 try:
-                    await self._gripper.connect()
+                    await asyncio.to_thread(self._gripper.connect)
                     if self._gripper.is_connected:
                         logger.info("Reconnected to gripper backend")
                 except Exception as e:
@@ -215,6 +232,11 @@ class StateAggregator:
                 # Track position deltas for movement detection
                 self._update_movement_tracking(arm_q, base_pose, gripper_pos)
 
+                if len(arm_q) == 7:
+                    self._arm_ready.set()
+                else:
+                    self._arm_ready.clear()
+
                 self._state = {
                     "timestamp": time.time(),
                     "base": {"pose": base_pose, "velocity": base_velocity},
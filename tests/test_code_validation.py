@@ -22,6 +22,20 @@ def test_case(name: str, code: str, expected_valid: bool):
     print()
 
 
+def test_cache_hit():
+    """Resubmitted code returns the cached result object."""
+    validator = CodeValidator()
+    code = "import subprocess\n"
+    first = validator.validate(code)
+    ok = (
+        validator.validate(code) is first
+        and not first.valid
+        and validator.validate(code + "x = 1\n") is not first
+    )
+    print(f"[{'PASS' if ok else 'FAIL'}] Cache hit returns the same result")
+    print()
+
+
 def main():
     print("=" * 60)
     print("Code Validator Tests")
@@ -132,6 +146,78 @@ mod.system('ls')
     test_case("from subprocess import", """
 from subprocess import run, Popen
 run(['ls'])
+""", expected_valid=False)
+
+    # Non-ASCII source skips the ASCII word prefilter and is always scanned
+    print("--- Non-ASCII source ---")
+
+    test_case("Non-ASCII strings (allowed)", """
+name = "café"
+print(f"héllo {name} — ok")
+""", expected_valid=True)
+
+    test_case("Fullwidth eval (NFKC-normalized to eval)", """
+name = "café"
+ｅｖａｌ("1 + 1")
+""", expected_valid=False)
+
+    test_case("Fullwidth subprocess import", """
+import ｓｕｂｐｒｏｃｅｓｓ
+""", expected_valid=False)
+
+    # Blocked calls under nodes whose operators/contexts are pruned leaves
+    print("--- Blocked calls in nested expressions (should fail) ---")
+
+    test_case("Call in f-string", """
+print(f"{eval('1')}")
+""", expected_valid=False)
+
+    test_case("Call in comparison", """
+import os
+if os.system('ls') == 0:
+    pass
+""", expected_valid=False)
+
+    test_case("Call under not/or", """
+ok = not eval('0') or True
+""", expected_valid=False)
+
+    test_case("Call in binary operation", """
+total = 1 + eval('2')
+""", expected_valid=False)
+
+    test_case("Call in subscript", """
+d = {}
+v = d[eval('1')]
+""", expected_valid=False)
+
+    test_case("Call in keyword argument", """
+print('x', end=eval('""'))
+""", expected_valid=False)
+
+    test_case("Call in starred argument", """
+print(*eval('[1]'))
+""", expected_valid=False)
+
+    test_case("Call in lambda default", """
+f = lambda x=eval('1'): x
+""", expected_valid=False)
+
+    test_case("Call in comprehension", """
+xs = [exec(s) for s in ['x = 1']]
+""", expected_valid=False)
+
+    test_case("Call in decorator arguments", """
+def deco(x):
+    return lambda f: f
+
+@deco(eval('1'))
+def f():
+    pass
+""", expected_valid=False)
+
+    test_case("Attribute on a blocked call's result", """
+n = eval('[1]').count(1)
 """, expected_valid=False)
 
     # Syntax errors
@@ -142,6 +228,10 @@ def broken(
     print("missing paren")
 """, expected_valid=False)
 
+    print("--- Validation cache ---")
+
+    test_cache_hit()
+
     print("=" * 60)
     print("Tests complete")
     print("=" * 60)
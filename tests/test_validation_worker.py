@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Test out-of-process validation of large code (validation_worker.py).
+
+Sources of _WORKER_VALIDATE_MIN_SIZE characters or more are validated by
+CodeExecutor.validate_code_async in a worker process. Covers the worker round
+trip, the in-process fallback when the worker dies mid-request, restarting
+the worker, and cancellation.
+
+Run: python3 test_validation_worker.py
+"""
+
+import asyncio
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, '.')
+
+import code_executor
+from code_executor import CodeExecutor, CodeValidator
+
+
+def large_code(body: str, min_size: int = code_executor._WORKER_VALIDATE_MIN_SIZE) -> str:
+    """Pad ``body`` with harmless lines past ``min_size`` characters."""
+    padding = "x = 1\n" * (min_size // 6 + 1)
+    return padding + body
+
+
+async def test_worker_round_trip():
+    """Large code is validated by the worker with the in-process result."""
+    print("\n[Test] Large code through the worker")
+    executor = CodeExecutor()
+    try:
+        code = large_code("import subprocess\n")
+        assert len(code) >= code_executor._WORKER_VALIDATE_MIN_SIZE
+        result = await executor.validate_code_async(code)
+        print(f"  Result: valid={result.valid}, errors={result.errors}")
+        assert executor._validation_worker is not None, "❌ worker not started"
+        assert result == CodeValidator().validate(code), "❌ worker result differs"
+
+        result = await executor.validate_code_async(large_code("print('ok')\n"))
+        assert result.valid, "❌ valid code rejected"
+        print("  ✓ Worker results match in-process validation")
+    finally:
+        executor.close_validation_worker()
+
+
+async def test_worker_killed_mid_request():
+    """A worker killed mid-request falls back to in-process validation."""
+    print("\n[Test] Worker killed mid-request")
+    executor = CodeExecutor()
+    try:
+        # Big enough that the worker is still busy when it is killed
+        code = large_code("eval('1')\n", min_size=1_000_000)
+        task = asyncio.create_task(executor.validate_code_async(code))
+        while executor._validation_worker is None:
+            await asyncio.sleep(0.001)
+        worker = executor._validation_worker
+        worker.kill()
+
+        result = await task
+        print(f"  Result: valid={result.valid}, errors={result.errors}")
+        assert not result.valid, "❌ fallback missed eval()"
+        assert executor._validation_worker is None, "❌ dead worker kept"
+        print("  ✓ Fell back to in-process validation")
+
+        result = await executor.validate_code_async(large_code("import os\n"))
+        assert result.valid
+        assert executor._validation_worker not in (None, worker), "❌ worker not restarted"
+        print("  ✓ Next request started a new worker")
+    finally:
+        executor.close_validation_worker()
+
+
+async def test_cancelled_request():
+    """A cancelled request discards the worker so no stale reply is read."""
+    print("\n[Test] Cancelled request")
+    executor = CodeExecutor()
+    try:
+        task = asyncio.create_task(
+            executor.validate_code_async(large_code("import socket\n", min_size=1_000_000))
+        )
+        while executor._validation_worker is None:
+            await asyncio.sleep(0.001)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        assert executor._validation_worker is None, "❌ worker kept after cancel"
+
+        code = large_code("import shutil\n")
+        result = await executor.validate_code_async(code)
+        assert result == CodeValidator().validate(code), "❌ stale reply returned"
+        print("  ✓ Next request got its own result")
+    finally:
+        executor.close_validation_worker()
+
+
+async def main():
+    print("=" * 60)
+    print("Validation Worker Tests")
+    print("=" * 60)
+
+    await test_worker_round_trip()
+    await test_worker_killed_mid_request()
+    await test_cancelled_request()
+
+    print("\n" + "=" * 60)
+    print("All tests passed")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
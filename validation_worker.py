@@ -0,0 +1,25 @@
+"""Out-of-process CodeValidator for CodeExecutor.validate_code_async.
+
+Reads one JSON-encoded source string per line on stdin and answers each with
+one JSON line ``{"valid": ..., "errors": [...]}`` on stdout, so parsing large
+submissions doesn't hold the server's GIL. Started as a plain script (never
+through multiprocessing), so the server's ``__main__`` is not re-imported.
+Exits when stdin closes.
+"""
+
+import json
+import sys
+
+from code_executor import CodeValidator
+
+
+def main() -> None:
+    validator = CodeValidator()
+    for line in sys.stdin:
+        result = validator.validate(json.loads(line))
+        sys.stdout.write(json.dumps({"valid": result.valid, "errors": result.errors}) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()